@@ -0,0 +1,213 @@
+# Importamos las bibliotecas necesarias
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+# Variable de entorno que activa la captura: CAPTURA_TRAFICO=trafico.jsonl
+VARIABLE_CAPTURA = 'CAPTURA_TRAFICO'
+
+
+class Capturador:
+    """
+    Registra cada solicitud y su respuesta en un archivo JSON Lines.
+    Se conecta a requests como hook de respuesta: hooks={'response': capturador.registrar}.
+    Las solicitudes que fallan sin respuesta (timeout, error de conexión) también se registran,
+    con el nombre de la excepción como estado: son justo el tráfico de una caída.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, 'a', encoding='utf-8')
+        self._candado = threading.Lock()
+        atexit.register(self.cerrar)
+        _interceptar_errores()
+
+    def registrar(self, response, *args, **kwargs):
+        """Hook de requests: guarda método, ruta, cuerpo, instante, estado y latencia."""
+        self._escribir(response.request, response.status_code, response.elapsed.total_seconds())
+        return response
+
+    def registrar_error(self, solicitud, error, latencia):
+        """Guarda una solicitud que terminó en excepción (el hook de respuesta no se ejecuta)."""
+        self._escribir(solicitud, type(error).__name__, latencia)
+
+    def _escribir(self, solicitud, estado, latencia):
+        url = urlsplit(solicitud.url)
+        cuerpo = solicitud.body
+        if isinstance(cuerpo, bytes):
+            cuerpo = cuerpo.decode('utf-8', errors='replace')
+        registro = {
+            'ts': round(time.time() - latencia, 6),  # Instante en que se envió la solicitud
+            'metodo': solicitud.method,
+            'ruta': url.path + (f'?{url.query}' if url.query else ''),
+            'cuerpo': cuerpo,
+            'estado': estado,
+            'latencia_ms': round(latencia * 1000, 3)
+        }
+        linea = json.dumps(registro, ensure_ascii=False, separators=(',', ':'))
+        with self._candado:
+            if not self._archivo.closed:
+                self._archivo.write(linea + '\n')
+
+    def hooks(self):
+        """Diccionario listo para pasar como hooks= a requests."""
+        return {'response': self.registrar}
+
+    def cerrar(self):
+        with self._candado:
+            if not self._archivo.closed:
+                self._archivo.close()
+
+
+_enviar_adaptador = requests.adapters.HTTPAdapter.send
+
+
+def _enviar_capturando(adaptador, solicitud, *args, **kwargs):
+    # Envoltura de HTTPAdapter.send: si la solicitud lleva el hook de un Capturador y lanza
+    # una excepción, se registra con el tiempo transcurrido antes de propagarla
+    inicio = time.perf_counter()
+    try:
+        return _enviar_adaptador(adaptador, solicitud, *args, **kwargs)
+    except Exception as e:
+        latencia = time.perf_counter() - inicio
+        for hook in (solicitud.hooks or {}).get('response', []):
+            capturador = getattr(hook, '__self__', None)
+            if isinstance(capturador, Capturador):
+                capturador.registrar_error(solicitud, e, latencia)
+        raise
+
+
+def _interceptar_errores():
+    # Se instala una sola vez y solo cuando hay captura activa; sin el hook no cambia nada
+    requests.adapters.HTTPAdapter.send = _enviar_capturando
+
+
+def hooks_desde_entorno():
+    """
+    Devuelve los hooks de captura si la variable CAPTURA_TRAFICO está definida.
+    Returns:
+        dict: {'response': ...} para activar la captura o {} si está desactivada.
+    """
+    ruta = os.environ.get(VARIABLE_CAPTURA)
+    if not ruta:
+        return {}
+    return Capturador(ruta).hooks()
+
+
+def leer_captura(ruta):
+    """
+    Lee un archivo de captura.
+    Returns:
+        list: Registros ordenados por el instante de envío.
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        registros = [json.loads(linea) for linea in archivo if linea.strip()]
+    return sorted(registros, key=lambda r: r['ts'])
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por el método del rango más cercano."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+def _enviar(sesion, base_url, registro, programado, timeout):
+    # Envía una solicitud capturada. La latencia se mide desde que el hilo la envía (igual que en
+    # la captura, para poder compararlas); el atraso respecto al instante programado va aparte
+    inicio = time.perf_counter()
+    try:
+        respuesta = sesion.request(
+            registro['metodo'],
+            base_url.rstrip('/') + registro['ruta'],
+            data=registro['cuerpo'].encode('utf-8') if registro.get('cuerpo') else None,
+            headers={'Content-Type': 'application/json'},
+            timeout=timeout
+        )
+        estado = respuesta.status_code
+    except requests.exceptions.RequestException as e:
+        estado = type(e).__name__
+    fin = time.perf_counter()
+    return {
+        'estado': estado,
+        'latencia_ms': (fin - inicio) * 1000,
+        'retraso_ms': (inicio - programado) * 1000  # Atraso del envío respecto al plan
+    }
+
+
+def reproducir(registros, base_url, velocidad=1.0, hilos=32, timeout=10):
+    """
+    Vuelve a enviar el tráfico capturado respetando los tiempos entre llegadas.
+    Args:
+        registros (list): Registros leídos con leer_captura().
+        base_url (str): URL base destino (por ejemplo http://localhost:8000).
+        velocidad (float): 1 = tiempo real, 10 = diez veces más rápido, 0 = sin pausas.
+        hilos (int): Solicitudes simultáneas máximas.
+        timeout (float): Tiempo máximo de espera por solicitud.
+    Returns:
+        list: Un resultado por registro, en el mismo orden.
+    """
+    if not registros:
+        return []
+    sesion = requests.Session()
+    # Ajustamos el pool de conexiones al número de hilos
+    adaptador = requests.adapters.HTTPAdapter(pool_connections=hilos, pool_maxsize=hilos)
+    sesion.mount('http://', adaptador)
+    sesion.mount('https://', adaptador)
+
+    t0 = registros[0]['ts']
+    inicio = time.perf_counter()
+    futuros = []
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        for registro in registros:
+            # Ciclo abierto: cada envío se programa según la captura, sin esperar respuestas
+            programado = inicio + ((registro['ts'] - t0) / velocidad if velocidad > 0 else 0)
+            espera = programado - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+            futuros.append(ejecutor.submit(_enviar, sesion, base_url, registro, programado, timeout))
+    return [f.result() for f in futuros]
+
+
+def comparar(registros, resultados):
+    """Imprime las latencias de la captura original frente a la reproducción."""
+    originales = [r['latencia_ms'] for r in registros]
+    nuevas = [r['latencia_ms'] for r in resultados]
+    print(f"Solicitudes: {len(resultados)}")
+    print(f"{'':>12}{'original':>12}{'reproducción':>14}")
+    for p in (50, 95, 99):
+        print(f"{'p' + str(p) + ' (ms)':>12}{percentil(originales, p):>12.1f}{percentil(nuevas, p):>14.1f}")
+    print(f"{'máx. (ms)':>12}{max(originales):>12.1f}{max(nuevas):>14.1f}")
+    print(f"Retraso p99 de envío: {percentil([r['retraso_ms'] for r in resultados], 99):.1f} ms")
+    distintos = sum(1 for r, n in zip(registros, resultados) if r['estado'] != n['estado'])
+    print(f"Respuestas con estado distinto al original: {distintos}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reproduce tráfico capturado con CAPTURA_TRAFICO')
+    parser.add_argument('captura', help='Archivo JSONL generado durante la captura')
+    parser.add_argument('--base', required=True, help='URL base destino (ej. http://localhost:8000)')
+    parser.add_argument('--velocidad', type=float, default=1.0,
+                        help='Factor de velocidad: 1, 10, ... o 0 para la máxima')
+    parser.add_argument('--hilos', type=int, default=32, help='Solicitudes simultáneas máximas')
+    args = parser.parse_args()
+
+    registros = leer_captura(args.captura)
+    if not registros:
+        print("La captura está vacía.")
+        return
+    resultados = reproducir(registros, args.base, args.velocidad, args.hilos)
+    comparar(registros, resultados)
+
+
+if __name__ == '__main__':
+    main()
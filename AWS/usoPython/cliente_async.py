@@ -0,0 +1,194 @@
+import asyncio  # Biblioteca para ejecutar muchas solicitudes a la vez sin hilos
+import json  # Para leer el mensaje de error que devuelve la API
+from dataclasses import dataclass, asdict  # Clases de datos para los resultados tipados
+from typing import AsyncIterator, Iterable, List, Optional
+
+import aiohttp  # Cliente HTTP asíncrono (pip install aiohttp)
+
+# URL de la API (reemplaza con tu URL de invocación)
+API_URL = 'https://yg13sh47v3.execute-api.us-east-1.amazonaws.com'
+
+# Atributos de Usuario; la API lee solo estos (?fields=, ProjectionExpression)
+CAMPOS_USUARIO = 'id,nombre,correo'
+# Solicitudes simultáneas por defecto en las operaciones masivas
+CONCURRENCIA = 50
+# Códigos que indican saturación temporal (se reintentan con espera creciente)
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class Usuario:
+    id: str
+    nombre: str
+    correo: str
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> 'Usuario':
+        return cls(id=str(datos['id']), nombre=datos.get('nombre', ''), correo=datos.get('correo', ''))
+
+
+@dataclass(frozen=True)
+class Resultado:
+    """Resultado de una operación dentro de un lote: el usuario o el error, nunca una excepción."""
+    id: str
+    usuario: Optional[Usuario] = None
+    estado: Optional[int] = None  # Código HTTP del error (None si tuvo éxito o no hubo respuesta)
+    error: Optional[str] = None
+
+    @property
+    def exito(self) -> bool:
+        return self.error is None
+
+
+class ErrorAPI(Exception):
+    """Respuesta con error de la API (o fallo de conexión, con estado None)."""
+
+    def __init__(self, estado: Optional[int], mensaje: str):
+        super().__init__(f'{estado}: {mensaje}' if estado else mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+def mensaje_error(cuerpo: str) -> str:
+    # La Lambda responde los errores como {"mensaje": "..."}; si no, se usa el texto completo
+    try:
+        return json.loads(cuerpo)['mensaje']
+    except (ValueError, KeyError, TypeError):
+        return cuerpo
+
+
+class ClienteUsuariosAsync:
+    """
+    Cliente asíncrono de la API de Usuarios: las mismas operaciones que data.py, pero devuelven
+    objetos Usuario en lugar de imprimir, y todas comparten una sola sesión con conexiones
+    reutilizables. Las operaciones masivas (get_many, create_many) envían hasta `concurrencia`
+    solicitudes a la vez.
+
+    Uso:
+        async with ClienteUsuariosAsync(API_URL) as cliente:
+            usuarios = await cliente.get_many(['1', '2', '3'])
+    """
+
+    def __init__(self, api_url: str = API_URL, concurrencia: int = CONCURRENCIA,
+                 timeout: float = 30, reintentos: int = 2):
+        self.api_url = api_url.rstrip('/')
+        self.concurrencia = concurrencia
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.reintentos = reintentos
+        self._sesion: Optional[aiohttp.ClientSession] = None
+        self._semaforo = asyncio.Semaphore(concurrencia)
+
+    async def __aenter__(self) -> 'ClienteUsuariosAsync':
+        # El conector limita las conexiones abiertas al mismo número de solicitudes simultáneas
+        conector = aiohttp.TCPConnector(limit=self.concurrencia)
+        self._sesion = aiohttp.ClientSession(connector=conector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.cerrar()
+
+    async def cerrar(self) -> None:
+        if self._sesion is not None:
+            await self._sesion.close()
+            self._sesion = None
+
+    async def _solicitar(self, metodo: str, ruta: str, **kwargs):
+        """Envía una solicitud y devuelve el JSON; lanza ErrorAPI si la API responde con error."""
+        if self._sesion is None:
+            raise RuntimeError("Use el cliente dentro de 'async with ClienteUsuariosAsync(...)'")
+        for intento in range(self.reintentos + 1):
+            try:
+                async with self._semaforo:
+                    async with self._sesion.request(metodo, f'{self.api_url}{ruta}', **kwargs) as respuesta:
+                        if respuesta.status < 400:
+                            return await respuesta.json(content_type=None)
+                        cuerpo = await respuesta.text()
+                        if respuesta.status not in CODIGOS_REINTENTABLES or intento == self.reintentos:
+                            raise ErrorAPI(respuesta.status, mensaje_error(cuerpo))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if intento == self.reintentos:
+                    raise ErrorAPI(None, f'Error de conexión: {e or type(e).__name__}') from e
+            await asyncio.sleep(0.2 * 2 ** intento)  # Espera creciente antes de reintentar (sin ocupar el semáforo)
+
+    async def crear_usuario(self, id_usuario: str, nombre: str, correo: str) -> Usuario:
+        datos = await self._solicitar('POST', '/usuarios',
+                                      json={'id': str(id_usuario), 'nombre': nombre, 'correo': correo})
+        return Usuario.desde_dict(datos)
+
+    async def obtener_usuario(self, id_usuario: str) -> Optional[Usuario]:
+        """Devuelve el usuario, o None si no existe (404)."""
+        try:
+            datos = await self._solicitar('GET', f'/usuarios/{id_usuario}', params={'fields': CAMPOS_USUARIO})
+            return Usuario.desde_dict(datos)
+        except ErrorAPI as e:
+            if e.estado == 404:
+                return None
+            raise
+
+    async def actualizar_usuario(self, id_usuario: str, nombre: str, correo: str) -> Usuario:
+        datos = await self._solicitar('PUT', '/usuarios',
+                                      json={'id': str(id_usuario), 'nombre': nombre, 'correo': correo})
+        return Usuario.desde_dict(datos)
+
+    async def borrar_usuario(self, id_usuario: str) -> None:
+        await self._solicitar('DELETE', f'/usuarios/{id_usuario}')
+
+    async def listar_usuarios(self, tamano_pagina: int = 100) -> AsyncIterator[Usuario]:
+        """Recorre GET /usuarios página por página (ver paginacion.py), un usuario a la vez."""
+        parametros = {'limite': str(tamano_pagina), 'fields': CAMPOS_USUARIO}
+        while True:
+            pagina = await self._solicitar('GET', '/usuarios', params=parametros)
+            if isinstance(pagina, list):
+                # La API no soporta paginación y devolvió la lista completa
+                for datos in pagina:
+                    yield Usuario.desde_dict(datos)
+                return
+            for datos in pagina.get('items', []):
+                yield Usuario.desde_dict(datos)
+            if not pagina.get('siguiente'):
+                return
+            parametros['siguiente'] = pagina['siguiente']
+
+    async def _resultado(self, id_usuario: str, operacion) -> Resultado:
+        # Convierte el resultado (o el error) de una operación en un Resultado del lote
+        try:
+            usuario = await operacion
+        except ErrorAPI as e:
+            return Resultado(id=id_usuario, estado=e.estado, error=e.mensaje)
+        if usuario is None:
+            return Resultado(id=id_usuario, estado=404, error='Usuario no encontrado')
+        return Resultado(id=id_usuario, usuario=usuario)
+
+    async def get_many(self, ids: Iterable[str]) -> List[Resultado]:
+        """Obtiene muchos usuarios a la vez; devuelve un Resultado por ID, en el mismo orden."""
+        ids = [str(i) for i in ids]
+        return list(await asyncio.gather(*(self._resultado(i, self.obtener_usuario(i)) for i in ids)))
+
+    async def create_many(self, registros: Iterable[dict]) -> List[Resultado]:
+        """
+        Crea muchos usuarios a la vez. Cada registro es un diccionario con id, nombre y correo
+        (por ejemplo las filas de un Excel: df.to_dict('records')).
+        Devuelve un Resultado por registro, en el mismo orden.
+        """
+        registros = list(registros)
+        return list(await asyncio.gather(*(
+            self._resultado(str(r['id']), self.crear_usuario(r['id'], r['nombre'], r['correo']))
+            for r in registros
+        )))
+
+
+async def ejemplo():
+    # Crea tres usuarios y los vuelve a leer en paralelo
+    async with ClienteUsuariosAsync(API_URL, concurrencia=10) as cliente:
+        creados = await cliente.create_many([
+            {'id': '20', 'nombre': 'Ana Nova', 'correo': 'ana@ejemplo.com'},
+            {'id': '21', 'nombre': 'Jose Jaime', 'correo': 'jose@ejemplo.com'},
+            {'id': '22', 'nombre': 'Gertrudis', 'correo': 'gertrudis@ejemplo.com'},
+        ])
+        print('Creados:', sum(r.exito for r in creados), 'de', len(creados))
+        for resultado in await cliente.get_many(['20', '21', '22', '999']):
+            print(asdict(resultado))
+
+
+if __name__ == '__main__':
+    asyncio.run(ejemplo())
@@ -1,5 +1,6 @@
 import requests  # Para enviar solicitudes HTTP a la API
 import json  # Para manejar datos JSON
+from paginacion import iterar_usuarios  # Recorre el listado por páginas
 
 # URL de la API (reemplaza con tu URL de invocación)
 API_URL = 'https://yg13sh47v3.execute-api.us-east-1.amazonaws.com'
@@ -19,14 +20,10 @@ def crear_usuario(id, nombre, correo):
         print(f'[X]......Error al crear usuario: {e}')
 
 def listar_usuarios():
-    """Envía una solicitud GET para listar todos los usuarios."""
-    url = f'{API_URL}/usuarios'
+    """Lista todos los usuarios página por página, mostrándolos a medida que llegan."""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        usuarios = response.json()
         print('-> Usuarios encontrados:')
-        for usuario in usuarios:
+        for usuario in iterar_usuarios(API_URL):
             print(f"- ID: {usuario['id']}, Nombre: {usuario['nombre']}, Correo: {usuario['correo']}")
     except requests.exceptions.RequestException as e:
         print(f'[X]......Error al listar usuarios: {e}')
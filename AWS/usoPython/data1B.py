@@ -1,6 +1,8 @@
 import requests
 import json
 from colorama import init, Fore, Style
+from captura import hooks_desde_entorno
+from paginacion import iterar_usuarios
 
 # Initialize colorama for colored output
 init(autoreset=True)
@@ -8,6 +10,9 @@ init(autoreset=True)
 # URL de la API (reemplaza con tu URL de invocación)
 API_URL = 'https://yg13sh47v3.execute-api.us-east-1.amazonaws.com'
 
+# Captura de tráfico (se activa con la variable de entorno CAPTURA_TRAFICO=archivo.jsonl)
+HOOKS_CAPTURA = hooks_desde_entorno()
+
 class SimpleAPIClientCLI:
     def display_menu(self):
         print(f"{Fore.CYAN}=== MENU API Cliente ===")
@@ -40,20 +45,16 @@ class SimpleAPIClientCLI:
         headers = {'content-type': 'application/json'}
         data = {'id': str(id_usuario), 'nombre': nombre, 'correo': correo}
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(data))
+            response = requests.post(url, headers=headers, data=json.dumps(data), hooks=HOOKS_CAPTURA)
             response.raise_for_status()
             print(f"{Fore.GREEN}Usuario creado: {response.json()}")
         except requests.exceptions.RequestException as e:
             print(f"{Fore.RED}[X] Error al crear usuario: {e}")
 
     def listar_usuarios(self):
-        url = f'{API_URL}/usuarios'
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            usuarios = response.json()
             print(f"{Fore.GREEN}Usuarios encontrados:")
-            for usuario in usuarios:
+            for usuario in iterar_usuarios(API_URL, hooks=HOOKS_CAPTURA):
                 print(f"{Fore.YELLOW}- ID: {usuario['id']}, Nombre: {usuario['nombre']}, Correo: {usuario['correo']}")
         except requests.exceptions.RequestException as e:
             print(f"{Fore.RED}[X] Error al listar usuarios: {e}")
@@ -61,7 +62,7 @@ class SimpleAPIClientCLI:
     def obtener_usuario(self, id_usuario):
         url = f'{API_URL}/usuarios/{id_usuario}'
         try:
-            response = requests.get(url)
+            response = requests.get(url, hooks=HOOKS_CAPTURA)
             response.raise_for_status()
             usuario = response.json()
             print(f"{Fore.GREEN}Usuario encontrado: ID: {usuario['id']}, Nombre: {usuario['nombre']}, Correo: {usuario['correo']}")
@@ -73,7 +74,7 @@ class SimpleAPIClientCLI:
         headers = {'Content-Type': 'application/json'}
         data = {'id': str(id_usuario), 'nombre': nombre, 'correo': correo}
         try:
-            response = requests.put(url, headers=headers, data=json.dumps(data))
+            response = requests.put(url, headers=headers, data=json.dumps(data), hooks=HOOKS_CAPTURA)
             response.raise_for_status()
             print(f"{Fore.GREEN}Usuario actualizado: {response.json()}")
         except requests.exceptions.RequestException as e:
@@ -82,7 +83,7 @@ class SimpleAPIClientCLI:
     def borrar_usuario(self, id_usuario):
         url = f'{API_URL}/usuarios/{id_usuario}'
         try:
-            response = requests.delete(url)
+            response = requests.delete(url, hooks=HOOKS_CAPTURA)
             response.raise_for_status()
             print(f"{Fore.GREEN}Usuario borrado: {response.json()['mensaje']}")
         except requests.exceptions.RequestException as e:
@@ -3,6 +3,11 @@ import json  # Biblioteca para manejar datos en formato JSON
 import pandas as pd  # Biblioteca para leer y escribir archivos Excel
 from colorama import init, Fore, Style  # Biblioteca para salida de texto coloreada en la consola
 import os  # Biblioteca para verificar la existencia de archivos
+import time  # Biblioteca para medir la latencia de cada fila y esperar entre reintentos
+from captura import hooks_desde_entorno  # Captura opcional del tráfico para reproducirlo después
+from sincronizacion import calcular_diferencias, mostrar_reporte  # Sincronización por diferencias
+from paginacion import iterar_usuarios, CAMPOS_USUARIO  # Listado por páginas con descarga anticipada
+from telemetria import Telemetria  # Línea de estado y métricas para cargas masivas
 
 # Inicializa colorama para habilitar texto coloreado en la consola
 init(autoreset=True)
@@ -10,10 +15,20 @@ init(autoreset=True)
 # Define la URL base de la API (reemplazar con la URL real de la API)
 API_URL = 'https://yg13sh47v3.execute-api.us-east-1.amazonaws.com'
 
+# Captura de tráfico (se activa con la variable de entorno CAPTURA_TRAFICO=archivo.jsonl)
+HOOKS_CAPTURA = hooks_desde_entorno()
+
+# IDs por solicitud en la consulta de varios usuarios (la API acepta hasta 1.000 y los lee en lotes de 100)
+IDS_POR_SOLICITUD = 500
+# Veces que se piden los IDs que la API devolvió en sin_procesar (tabla saturada)
+INTENTOS_SIN_PROCESAR = 3
+
 class SimpleAPIClientCLI:
     def __init__(self):
         # Inicializa variables para la ruta del archivo Excel de entrada y los resultados
         self.excel_file = ""  # Ruta del archivo Excel de entrada
+        self.silencioso = False  # Cargas masivas con una sola línea de estado en vez de una línea por fila
+        self.archivo_metricas = None  # Archivo .prom o .json con métricas de la carga (opcional)
         self.results = []  # Lista para almacenar los resultados de las operaciones
         self.output_file = "api_results.xlsx"  # Nombre predeterminado del archivo Excel de salida
 
@@ -23,7 +38,7 @@ class SimpleAPIClientCLI:
         print(f"{Fore.GREEN}1. Especificar Archivo Excel de Entrada")  # Opción para cargar un archivo Excel de entrada
         print(f"{Fore.GREEN}2. Ingresar Usuario")  # Opción para crear un nuevo usuario
         print(f"{Fore.GREEN}3. Listar Usuarios")  # Opción para listar todos los usuarios
-        print(f"{Fore.GREEN}4. Buscar Usuario por ID")  # Opción para obtener un usuario por ID
+        print(f"{Fore.GREEN}4. Buscar Usuario por ID (varios separados por comas)")  # Opción para obtener uno o varios usuarios por ID
         print(f"{Fore.GREEN}5. Actualizar Usuario")  # Opción para actualizar un usuario
         print(f"{Fore.GREEN}6. Borrar Usuario")  # Opción para eliminar un usuario
         print(f"{Fore.GREEN}7. Guardar Resultados en Excel")  # Opción para guardar resultados en un archivo Excel
@@ -84,13 +99,13 @@ class SimpleAPIClientCLI:
             return None
         return id_usuario  # Devuelve el ID del usuario
 
-    def crear_usuario(self, id_usuario, nombre, correo):
+    def crear_usuario(self, id_usuario, nombre, correo, mostrar=True):
         # Envía una solicitud POST para crear un nuevo usuario
         url = f'{API_URL}/usuarios'  # Endpoint de la API para crear usuarios
         headers = {'content-type': 'application/json'}  # Especifica el tipo de contenido JSON
         data = {'id': str(id_usuario), 'nombre': nombre, 'correo': correo}  # Datos del usuario en formato diccionario
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(data))  # Envía la solicitud POST
+            response = requests.post(url, headers=headers, data=json.dumps(data), hooks=HOOKS_CAPTURA)  # Envía la solicitud POST
             response.raise_for_status()  # Lanza un error si la solicitud falla
             result = response.json()
             # Almacena el resultado de la operación
@@ -98,30 +113,32 @@ class SimpleAPIClientCLI:
                 'id': id_usuario, 'nombre': nombre, 'correo': correo,
                 'operation': 'create', 'status': 'success'
             })
-            print(f"{Fore.GREEN}Usuario creado: {result}")  # Muestra mensaje de éxito con la respuesta
+            if mostrar:
+                print(f"{Fore.GREEN}Usuario creado: {result}")  # Muestra mensaje de éxito con la respuesta
+            return True
         except requests.exceptions.RequestException as e:
             # Almacena el error en los resultados
             self.results.append({
                 'id': id_usuario, 'nombre': nombre, 'correo': correo,
                 'operation': 'create', 'status': 'failed', 'error': str(e)
             })
-            print(f"{Fore.RED}[X] Error al crear usuario: {e}")  # Muestra mensaje de error
+            if mostrar:
+                print(f"{Fore.RED}[X] Error al crear usuario: {e}")  # Muestra mensaje de error
+            return False
 
     def listar_usuarios(self):
-        # Envía una solicitud GET para listar todos los usuarios
-        url = f'{API_URL}/usuarios'  # Endpoint de la API para listar usuarios
+        # Lista todos los usuarios página por página (la siguiente se descarga en segundo plano)
+        total = 0
         try:
-            response = requests.get(url)  # Envía la solicitud GET
-            response.raise_for_status()  # Lanza un error si la solicitud falla
-            usuarios = response.json()  # Analiza la respuesta JSON
-            # Almacena el resultado de la operación
-            self.results.append({
-                'operation': 'list', 'status': 'success', 'data': usuarios
-            })
             print(f"{Fore.GREEN}Usuarios encontrados:")  # Muestra encabezado para la lista de usuarios
-            for usuario in usuarios:
+            for usuario in iterar_usuarios(API_URL, hooks=HOOKS_CAPTURA):
+                total += 1
                 # Muestra los detalles de cada usuario en amarillo
                 print(f"{Fore.YELLOW}- ID: {usuario['id']}, Nombre: {usuario['nombre']}, Correo: {usuario['correo']}")
+            # Almacena el resultado de la operación (solo el total, no la lista completa)
+            self.results.append({
+                'operation': 'list', 'status': 'success', 'total': total
+            })
         except requests.exceptions.RequestException as e:
             # Almacena el error en los resultados
             self.results.append({
@@ -133,7 +150,7 @@ class SimpleAPIClientCLI:
         # Envía una solicitud GET para obtener un usuario por ID
         url = f'{API_URL}/usuarios/{id_usuario}'  # Endpoint de la API para obtener un usuario específico
         try:
-            response = requests.get(url)  # Envía la solicitud GET
+            response = requests.get(url, params={'fields': ','.join(CAMPOS_USUARIO)}, hooks=HOOKS_CAPTURA)  # Envía la solicitud GET
             response.raise_for_status()  # Lanza un error si la solicitud falla
             usuario = response.json()  # Analiza la respuesta JSON
             # Almacena el resultado de la operación
@@ -150,13 +167,65 @@ class SimpleAPIClientCLI:
             })
             print(f"{Fore.RED}[X] Error al obtener usuario: {e}")  # Muestra mensaje de error
 
-    def actualizar_usuario(self, id_usuario, nombre, correo):
+    def obtener_usuarios(self, ids):
+        # Obtiene varios usuarios con GET /usuarios?ids=1,2,3: una solicitud por cada IDS_POR_SOLICITUD IDs
+        # en lugar de una por usuario (la API los lee de DynamoDB en lotes de 100)
+        url = f'{API_URL}/usuarios'  # Endpoint de la API para listar y consultar varios usuarios
+        ids = list(dict.fromkeys(str(i).strip() for i in ids if str(i).strip()))  # Sin vacíos ni repetidos
+        encontrados, faltantes, sin_leer = [], [], []
+        try:
+            for inicio in range(0, len(ids), IDS_POR_SOLICITUD):
+                pendientes = ids[inicio:inicio + IDS_POR_SOLICITUD]
+                for intento in range(INTENTOS_SIN_PROCESAR):  # Se vuelven a pedir los IDs que DynamoDB no alcanzó a leer
+                    parametros = {'ids': ','.join(pendientes), 'fields': ','.join(CAMPOS_USUARIO)}
+                    response = requests.get(url, params=parametros, hooks=HOOKS_CAPTURA)
+                    response.raise_for_status()  # Lanza un error si la solicitud falla
+                    datos = response.json()
+                    encontrados.extend(datos['items'])
+                    faltantes.extend(datos['faltantes'])
+                    pendientes = datos.get('sin_procesar', [])
+                    if not pendientes:
+                        break
+                    if intento < INTENTOS_SIN_PROCESAR - 1:
+                        time.sleep(0.2 * 2 ** intento)  # Espera creciente para no insistir sobre la tabla saturada
+                else:
+                    sin_leer.extend(pendientes)  # Siguen sin leerse tras los reintentos
+        except requests.exceptions.RequestException as e:
+            # Almacena el error en los resultados
+            self.results.append({
+                'operation': 'get_many', 'status': 'failed', 'error': str(e)
+            })
+            print(f"{Fore.RED}[X] Error al obtener usuarios: {e}")  # Muestra mensaje de error
+            return None
+        print(f"{Fore.GREEN}Usuarios encontrados: {len(encontrados)} de {len(ids)}")
+        for usuario in encontrados:
+            # Almacena el resultado de cada usuario encontrado
+            self.results.append({
+                'id': usuario['id'], 'operation': 'get', 'status': 'success',
+                'nombre': usuario['nombre'], 'correo': usuario['correo']
+            })
+            print(f"{Fore.YELLOW}- ID: {usuario['id']}, Nombre: {usuario['nombre']}, Correo: {usuario['correo']}")
+        for id_usuario in faltantes:
+            # Almacena los IDs que no existen
+            self.results.append({
+                'id': id_usuario, 'operation': 'get', 'status': 'failed', 'error': 'Usuario no encontrado'
+            })
+            print(f"{Fore.RED}- ID: {id_usuario} no encontrado")
+        for id_usuario in sin_leer:
+            # Almacena los IDs que no se pudieron leer
+            self.results.append({
+                'id': id_usuario, 'operation': 'get', 'status': 'failed', 'error': 'No se pudo leer, intente de nuevo'
+            })
+            print(f"{Fore.YELLOW}- ID: {id_usuario} no se pudo leer (la tabla está saturada), intente de nuevo")
+        return encontrados
+
+    def actualizar_usuario(self, id_usuario, nombre, correo, mostrar=True):
         # Envía una solicitud PUT para actualizar un usuario existente
         url = f'{API_URL}/usuarios'  # Endpoint de la API para actualizar usuarios
         headers = {'Content-Type': 'application/json'}  # Especifica el tipo de contenido JSON
         data = {'id': str(id_usuario), 'nombre': nombre, 'correo': correo}  # Datos actualizados del usuario
         try:
-            response = requests.put(url, headers=headers, data=json.dumps(data))  # Envía la solicitud PUT
+            response = requests.put(url, headers=headers, data=json.dumps(data), hooks=HOOKS_CAPTURA)  # Envía la solicitud PUT
             response.raise_for_status()  # Lanza un error si la solicitud falla
             result = response.json()
             # Almacena el resultado de la operación
@@ -164,33 +233,81 @@ class SimpleAPIClientCLI:
                 'id': id_usuario, 'nombre': nombre, 'correo': correo,
                 'operation': 'update', 'status': 'success'
             })
-            print(f"{Fore.GREEN}Usuario actualizado: {result}")  # Muestra mensaje de éxito con la respuesta
+            if mostrar:
+                print(f"{Fore.GREEN}Usuario actualizado: {result}")  # Muestra mensaje de éxito con la respuesta
+            return True
         except requests.exceptions.RequestException as e:
             # Almacena el error en los resultados
             self.results.append({
                 'id': id_usuario, 'nombre': nombre, 'correo': correo,
                 'operation': 'update', 'status': 'failed', 'error': str(e)
             })
-            print(f"{Fore.RED}[X] Error al actualizar usuario: {e}")  # Muestra mensaje de error
+            if mostrar:
+                print(f"{Fore.RED}[X] Error al actualizar usuario: {e}")  # Muestra mensaje de error
+            return False
 
-    def borrar_usuario(self, id_usuario):
+    def borrar_usuario(self, id_usuario, mostrar=True):
         # Envía una solicitud DELETE para eliminar un usuario por ID
         url = f'{API_URL}/usuarios/{id_usuario}'  # Endpoint de la API para eliminar un usuario
         try:
-            response = requests.delete(url)  # Envía la solicitud DELETE
+            response = requests.delete(url, hooks=HOOKS_CAPTURA)  # Envía la solicitud DELETE
             response.raise_for_status()  # Lanza un error si la solicitud falla
             result = response.json()['mensaje']
             # Almacena el resultado de la operación
             self.results.append({
                 'id': id_usuario, 'operation': 'delete', 'status': 'success'
             })
-            print(f"{Fore.GREEN}Usuario borrado: {result}")  # Muestra mensaje de éxito
+            if mostrar:
+                print(f"{Fore.GREEN}Usuario borrado: {result}")  # Muestra mensaje de éxito
+            return True
         except requests.exceptions.RequestException as e:
             # Almacena el error en los resultados
             self.results.append({
                 'id': id_usuario, 'operation': 'delete', 'status': 'failed', 'error': str(e)
             })
-            print(f"{Fore.RED}[X] Error al borrar usuario: {e}")  # Muestra mensaje de error
+            if mostrar:
+                print(f"{Fore.RED}[X] Error al borrar usuario: {e}")  # Muestra mensaje de error
+            return False
+
+    def procesar_filas(self, operacion, filas, nombre):
+        # Aplica la operación a cada fila; en modo silencioso muestra una sola línea de estado
+        # (tasa, éxitos/fallos, p50/p99 y tiempo restante) y exporta métricas si se configuró
+        filas = list(filas)
+        with Telemetria(total=len(filas), nombre=nombre, mostrar=self.silencioso,
+                        archivo_metricas=self.archivo_metricas) as telemetria:
+            for fila in filas:
+                inicio = time.perf_counter()
+                exito = operacion(*fila, mostrar=not self.silencioso)
+                telemetria.registrar(exito, time.perf_counter() - inicio)
+
+    def obtener_usuarios_remotos(self):
+        # Consulta una sola vez el estado actual de todos los usuarios en la API
+        try:
+            return list(iterar_usuarios(API_URL, hooks=HOOKS_CAPTURA))  # Recorre todas las páginas
+        except requests.exceptions.RequestException as e:
+            print(f"{Fore.RED}[X] Error al consultar usuarios: {e}")  # Muestra mensaje de error
+            return None
+
+    def sincronizar_excel(self, df):
+        # Envía solo las filas del Excel que difieren del servidor (crear, actualizar y opcionalmente borrar)
+        usuarios = self.obtener_usuarios_remotos()
+        if usuarios is None:
+            return
+        borrar = input(f"{Fore.CYAN}¿Borrar usuarios que no están en el Excel? (s/n): {Style.RESET_ALL}").strip().lower() == 's'
+        diferencias = calcular_diferencias(df, usuarios, borrar=borrar)
+        mostrar_reporte(diferencias)  # Reporte de simulación antes de enviar
+        if not (diferencias['crear'] or diferencias['actualizar'] or diferencias['borrar']):
+            print(f"{Fore.GREEN}El servidor ya coincide con el Excel.")
+            return
+        if input(f"{Fore.CYAN}¿Aplicar los cambios? (s/n): {Style.RESET_ALL}").strip().lower() != 's':
+            print(f"{Fore.YELLOW}Simulación terminada, no se envió ningún cambio.")
+            return
+        if diferencias['crear']:
+            self.procesar_filas(self.crear_usuario, diferencias['crear'], 'crear')
+        if diferencias['actualizar']:
+            self.procesar_filas(self.actualizar_usuario, diferencias['actualizar'], 'actualizar')
+        if diferencias['borrar']:
+            self.procesar_filas(self.borrar_usuario, [(i,) for i in diferencias['borrar']], 'borrar')
 
     def run(self):
         # Bucle principal para ejecutar la interfaz CLI y manejar las interacciones del usuario
@@ -204,13 +321,16 @@ class SimpleAPIClientCLI:
                     print(f"{Fore.GREEN}Archivo Excel configurado: {self.excel_file}")
                 else:
                     print(f"{Fore.YELLOW}No se especificó archivo Excel. Se usará ingreso manual.")
+                # Opciones para cargas largas: línea de estado y exportación de métricas
+                self.silencioso = input(f"{Fore.CYAN}¿Modo silencioso con línea de estado para cargas masivas? (s/n): {Style.RESET_ALL}").strip().lower() == 's'
+                self.archivo_metricas = input(f"{Fore.CYAN}Archivo de métricas .prom o .json (vacío = ninguno): {Style.RESET_ALL}").strip() or None
             elif choice == '2':
                 # Crea nuevos usuarios usando Excel o ingreso manual
                 df = self.read_excel() if self.excel_file else None
                 if df is not None:
                     # Procesa cada fila del archivo Excel
-                    for _, row in df.iterrows():
-                        self.crear_usuario(row['id'], row['nombre'], row['correo'])
+                    filas = df[['id', 'nombre', 'correo']].itertuples(index=False, name=None)
+                    self.procesar_filas(self.crear_usuario, filas, 'crear')
                 else:
                     # Solicita datos manualmente si no hay archivo Excel válido
                     user_data = self.get_user_input()
@@ -220,17 +340,24 @@ class SimpleAPIClientCLI:
                 # Lista todos los usuarios
                 self.listar_usuarios()
             elif choice == '4':
-                # Obtiene un usuario por ID
+                # Obtiene un usuario por ID, o varios en una sola consulta si se separan por comas
                 id_usuario = self.get_user_id()
-                if id_usuario:
+                if id_usuario and ',' in id_usuario:
+                    self.obtener_usuarios(id_usuario.split(','))
+                elif id_usuario:
                     self.obtener_usuario(id_usuario)
             elif choice == '5':
                 # Actualiza usuarios usando Excel o ingreso manual
                 df = self.read_excel() if self.excel_file else None
                 if df is not None:
-                    # Procesa cada fila del archivo Excel
-                    for _, row in df.iterrows():
-                        self.actualizar_usuario(row['id'], row['nombre'], row['correo'])
+                    modo = input(f"{Fore.CYAN}¿Enviar solo las filas que cambiaron? (s/n): {Style.RESET_ALL}").strip().lower()
+                    if modo == 's':
+                        # Compara con el servidor y envía solo las diferencias
+                        self.sincronizar_excel(df)
+                    else:
+                        # Procesa cada fila del archivo Excel
+                        filas = df[['id', 'nombre', 'correo']].itertuples(index=False, name=None)
+                        self.procesar_filas(self.actualizar_usuario, filas, 'actualizar')
                 else:
                     # Solicita datos manualmente si no hay archivo Excel válido
                     user_data = self.get_user_input()
@@ -0,0 +1,45 @@
+import requests  # Biblioteca para realizar solicitudes HTTP a la API
+from concurrent.futures import ThreadPoolExecutor  # Hilo en segundo plano para pedir la página siguiente
+
+# Usuarios por página que se piden a la API
+TAMANO_PAGINA = 100
+# Atributos que usan los clientes; la API lee solo estos (?fields=, ProjectionExpression)
+CAMPOS_USUARIO = ('id', 'nombre', 'correo')
+
+
+def iterar_usuarios(api_url, tamano_pagina=TAMANO_PAGINA, hooks=None, timeout=30, campos=CAMPOS_USUARIO):
+    """
+    Recorre GET /usuarios página por página, devolviendo un usuario a la vez.
+    Mientras se procesa una página, la siguiente se descarga en un hilo en segundo plano,
+    así el primer usuario llega tras una sola página y en memoria hay como máximo dos páginas.
+    - api_url: URL base de la API.
+    - tamano_pagina: Usuarios por página (parámetro 'limite').
+    - hooks: Hooks de requests (por ejemplo los de captura.py).
+    - campos: Atributos que se piden a la API (None = todos).
+    Lanza requests.exceptions.RequestException si alguna página falla.
+    """
+    url = f'{api_url}/usuarios'
+    sesion = requests.Session()  # Reutiliza la conexión entre páginas
+
+    def pedir_pagina(token):
+        parametros = {'limite': tamano_pagina}
+        if campos:
+            parametros['fields'] = ','.join(campos)
+        if token:
+            parametros['siguiente'] = token
+        response = sesion.get(url, params=parametros, hooks=hooks or {}, timeout=timeout)
+        response.raise_for_status()  # Lanza un error si la solicitud falla
+        return response.json()
+
+    with sesion, ThreadPoolExecutor(max_workers=1) as ejecutor:
+        futuro = ejecutor.submit(pedir_pagina, None)
+        while futuro is not None:
+            pagina = futuro.result()
+            if isinstance(pagina, list):
+                # La API no soporta paginación y devolvió la lista completa
+                yield from pagina
+                return
+            token = pagina.get('siguiente')
+            # Pide la página siguiente antes de entregar la actual
+            futuro = ejecutor.submit(pedir_pagina, token) if token else None
+            yield from pagina.get('items', [])
@@ -0,0 +1,60 @@
+import hashlib  # Biblioteca para calcular la huella (hash) de cada registro
+from colorama import Fore  # Biblioteca para salida de texto coloreada en la consola
+
+# Campos que se comparan entre el Excel y la API
+CAMPOS = ('id', 'nombre', 'correo')
+
+
+def normalizar_id(valor):
+    # Excel suele leer los IDs como números (1 o 1.0); la API los guarda como texto ('1')
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def huella(id_usuario, nombre, correo):
+    # Calcula un hash corto y estable de los campos id, nombre y correo
+    texto = '\x1f'.join((normalizar_id(id_usuario), str(nombre).strip(), str(correo).strip()))
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest()
+
+
+def calcular_diferencias(df, usuarios_remotos, borrar=False):
+    """
+    Compara las filas del Excel con el estado actual de la API (hash join por id).
+    - df: DataFrame con las columnas id, nombre, correo.
+    - usuarios_remotos: Lista de usuarios devuelta por GET /usuarios.
+    - borrar: Si es True, los usuarios que no están en el Excel se marcan para borrar.
+    Devuelve un diccionario con las listas 'crear', 'actualizar' y 'borrar'.
+    """
+    # Tabla hash id -> huella con el estado remoto (se consulta una sola vez)
+    remotos = {
+        normalizar_id(u['id']): huella(u['id'], u.get('nombre', ''), u.get('correo', ''))
+        for u in usuarios_remotos
+    }
+    crear, actualizar, vistos, sin_cambios = [], [], set(), 0
+    for id_usuario, nombre, correo in df[list(CAMPOS)].itertuples(index=False, name=None):
+        id_usuario = normalizar_id(id_usuario)
+        vistos.add(id_usuario)
+        actual = remotos.get(id_usuario)
+        if actual is None:
+            crear.append((id_usuario, nombre, correo))
+        elif actual != huella(id_usuario, nombre, correo):
+            actualizar.append((id_usuario, nombre, correo))
+        else:
+            sin_cambios += 1
+    eliminar = [id_usuario for id_usuario in remotos if id_usuario not in vistos] if borrar else []
+    return {'crear': crear, 'actualizar': actualizar, 'borrar': eliminar, 'sin_cambios': sin_cambios}
+
+
+def mostrar_reporte(diferencias, muestra=10):
+    # Muestra un resumen de los cambios (modo simulación: no se envía nada)
+    print(f"{Fore.CYAN}=== Diferencias Excel vs API ===")
+    print(f"{Fore.GREEN}Crear: {len(diferencias['crear'])}")
+    print(f"{Fore.YELLOW}Actualizar: {len(diferencias['actualizar'])}")
+    print(f"{Fore.RED}Borrar: {len(diferencias['borrar'])}")
+    print(f"{Fore.CYAN}Sin cambios: {diferencias['sin_cambios']}")
+    for operacion in ('crear', 'actualizar'):
+        for id_usuario, nombre, correo in diferencias[operacion][:muestra]:
+            print(f"  {operacion}: ID: {id_usuario}, Nombre: {nombre}, Correo: {correo}")
+    for id_usuario in diferencias['borrar'][:muestra]:
+        print(f"  borrar: ID: {id_usuario}")
@@ -0,0 +1,177 @@
+# Importamos las bibliotecas necesarias
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Límites (segundos) del histograma de latencias que se exporta a Prometheus
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Telemetria:
+    """
+    Estadísticas en vivo de una carga masiva: una sola línea de estado en la terminal
+    (tasa, éxitos/fallos, latencia p50/p99 y tiempo restante) que se refresca varias
+    veces por segundo, y opcionalmente un archivo de métricas Prometheus (.prom) o JSON
+    que un recolector local puede leer mientras dura la carga.
+
+    Uso:
+        with Telemetria(total=n, archivo_metricas='metricas.prom') as telemetria:
+            ...
+            telemetria.registrar(exito, latencia)
+    """
+
+    def __init__(self, total=None, nombre='carga', intervalo=0.25, archivo_metricas=None,
+                 mostrar=True, muestras=2048):
+        self.total = total
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self.archivo_metricas = archivo_metricas
+        self.mostrar = mostrar
+        self.exitos = 0
+        self.fallos = 0
+        self.suma_latencia = 0.0
+        self.cubetas = [0] * (len(LIMITES_LATENCIA) + 1)  # La última es +Inf
+        self._recientes = deque(maxlen=muestras)  # Latencias recientes para los percentiles
+        self._candado = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._inicio = None
+
+    def registrar(self, exito, latencia=None):
+        """
+        Registra el resultado de una operación (barato: no escribe en la terminal).
+        Con latencia None solo se cuenta (p. ej. una fila omitida sin enviarla), para no
+        meter muestras de 0 ms en los percentiles ni en el histograma.
+        """
+        with self._candado:
+            if exito:
+                self.exitos += 1
+            else:
+                self.fallos += 1
+            if latencia is None:
+                return
+            self.suma_latencia += latencia
+            self._recientes.append(latencia)
+            for i, limite in enumerate(LIMITES_LATENCIA):
+                if latencia <= limite:
+                    self.cubetas[i] += 1
+                    break
+            else:
+                self.cubetas[-1] += 1
+
+    def resumen(self):
+        """
+        Foto actual de las métricas.
+        Returns:
+            dict: hechos, éxitos, fallos, tasa por segundo, p50/p99 (s) y segundos restantes estimados.
+        """
+        with self._candado:
+            recientes = sorted(self._recientes)
+            exitos, fallos = self.exitos, self.fallos
+        hechos = exitos + fallos
+        transcurrido = max(time.perf_counter() - self._inicio, 1e-9) if self._inicio else 1e-9
+        tasa = hechos / transcurrido
+        restante = None
+        if self.total and tasa > 0:
+            restante = max(self.total - hechos, 0) / tasa
+        return {
+            'nombre': self.nombre,
+            'hechos': hechos,
+            'total': self.total,
+            'exitos': exitos,
+            'fallos': fallos,
+            'tasa': tasa,
+            'p50': recientes[len(recientes) // 2] if recientes else 0.0,
+            'p99': recientes[min(len(recientes) - 1, int(len(recientes) * 0.99))] if recientes else 0.0,
+            'transcurrido': transcurrido,
+            'restante': restante
+        }
+
+    def linea_estado(self, datos):
+        progreso = f"{datos['hechos']}/{datos['total']}" if datos['total'] else str(datos['hechos'])
+        eta = '--:--' if datos['restante'] is None else time.strftime('%H:%M:%S', time.gmtime(datos['restante']))
+        return (f"{progreso} | {datos['tasa']:.1f}/s | ok {datos['exitos']} err {datos['fallos']} | "
+                f"p50 {datos['p50'] * 1000:.0f} ms p99 {datos['p99'] * 1000:.0f} ms | ETA {eta}")
+
+    def escribir_metricas(self, datos):
+        """Escribe las métricas de forma atómica (archivo temporal + reemplazo)."""
+        if not self.archivo_metricas:
+            return
+        if self.archivo_metricas.endswith('.json'):
+            contenido = json.dumps(dict(datos, cubetas=dict(zip(
+                [str(l) for l in LIMITES_LATENCIA] + ['+Inf'], self._acumuladas())),
+                suma_latencia=self.suma_latencia), indent=2)
+        else:
+            contenido = self._prometheus(datos)
+        temporal = f"{self.archivo_metricas}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, self.archivo_metricas)
+
+    def _acumuladas(self):
+        # Prometheus usa cubetas acumuladas (le = "menor o igual que")
+        acumuladas, suma = [], 0
+        with self._candado:
+            for cantidad in self.cubetas:
+                suma += cantidad
+                acumuladas.append(suma)
+        return acumuladas
+
+    def _prometheus(self, datos):
+        etiqueta = f'trabajo="{self.nombre}"'
+        lineas = [
+            '# HELP carga_operaciones_total Operaciones terminadas por resultado.',
+            '# TYPE carga_operaciones_total counter',
+            f'carga_operaciones_total{{{etiqueta},resultado="exito"}} {datos["exitos"]}',
+            f'carga_operaciones_total{{{etiqueta},resultado="error"}} {datos["fallos"]}',
+            '# HELP carga_tasa_por_segundo Operaciones por segundo desde el inicio.',
+            '# TYPE carga_tasa_por_segundo gauge',
+            f'carga_tasa_por_segundo{{{etiqueta}}} {datos["tasa"]:.3f}',
+            '# HELP carga_restante_segundos Tiempo restante estimado.',
+            '# TYPE carga_restante_segundos gauge',
+            f'carga_restante_segundos{{{etiqueta}}} {-1 if datos["restante"] is None else round(datos["restante"], 1)}',
+            '# HELP carga_latencia_segundos Latencia de cada operación.',
+            '# TYPE carga_latencia_segundos histogram',
+        ]
+        acumuladas = self._acumuladas()
+        for limite, cantidad in zip([str(l) for l in LIMITES_LATENCIA] + ['+Inf'], acumuladas):
+            lineas.append(f'carga_latencia_segundos_bucket{{{etiqueta},le="{limite}"}} {cantidad}')
+        lineas.append(f'carga_latencia_segundos_sum{{{etiqueta}}} {self.suma_latencia:.6f}')
+        lineas.append(f'carga_latencia_segundos_count{{{etiqueta}}} {acumuladas[-1]}')
+        return '\n'.join(lineas) + '\n'
+
+    def _refrescar(self, final=False):
+        datos = self.resumen()
+        if self.mostrar:
+            # \r vuelve al inicio de la línea: la terminal muestra una sola línea que se actualiza
+            sys.stdout.write('\r' + self.linea_estado(datos) + ('\n' if final else ''))
+            sys.stdout.flush()
+        try:
+            self.escribir_metricas(datos)
+        except OSError:
+            pass  # Un error al exportar métricas no debe detener la carga
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            self._refrescar()
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        return self
+
+    def terminar(self):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join()
+        self._refrescar(final=True)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.terminar()
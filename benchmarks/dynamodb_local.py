@@ -0,0 +1,144 @@
+# Sustituto en memoria de DynamoDB para ejecutar las funciones Lambda sin AWS.
+# Implementa solo lo que usan los handlers del repositorio (Table.put_item, get_item,
+# update_item, delete_item, scan y batch_get_item del recurso) y se instala como si fuera
+# el módulo boto3.
+import re
+import sys
+import types
+
+# Claves primarias de las tablas que usan los handlers
+ESQUEMAS = {
+    'Usuarios': ('id',),
+    'ItemsTable': ('id',),
+    'FormularioData': ('nombre', 'fecha'),
+    'TransaccionesBancarias': ('idTransaccion', 'idCuenta'),
+}
+
+
+class ClientError(Exception):
+    """Imita botocore.exceptions.ClientError (con response['Error']['Code'])."""
+
+    def __init__(self, error_response, operation_name):
+        self.response = error_response
+        self.operation_name = operation_name
+        codigo = error_response.get('Error', {}).get('Code', 'Unknown')
+        super().__init__(f'An error occurred ({codigo}) when calling the {operation_name} operation')
+
+
+def campos_proyeccion(ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+    """Atributos (de primer nivel) de ProjectionExpression, o None si se piden todos."""
+    if not ProjectionExpression:
+        return None
+    nombres = ExpressionAttributeNames or {}
+    return [nombres.get(c.strip(), c.strip()) for c in ProjectionExpression.split(',')]
+
+
+def proyectar(item, campos):
+    """Copia del item con solo los atributos pedidos."""
+    if campos is None:
+        return dict(item)
+    return {c: item[c] for c in campos if c in item}
+
+
+class TablaLocal:
+    """Tabla DynamoDB en memoria: un diccionario clave primaria -> item."""
+
+    def __init__(self, nombre):
+        self.name = nombre
+        self.claves = ESQUEMAS.get(nombre, ('id',))
+        self.items = {}
+
+    def _clave(self, datos):
+        try:
+            return tuple(datos[c] for c in self.claves)
+        except KeyError as e:
+            raise ClientError({'Error': {'Code': 'ValidationException',
+                                         'Message': f'Falta la clave {e}'}}, 'Key')
+
+    def cargar(self, items):
+        """Inserta items directamente (para preparar los escenarios)."""
+        for item in items:
+            self.items[self._clave(item)] = dict(item)
+
+    def put_item(self, Item, **kwargs):
+        self.items[self._clave(Item)] = dict(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(self._clave(Key))
+        return {'Item': proyectar(item, campos_proyeccion(**kwargs))} if item is not None else {}
+
+    def delete_item(self, Key, **kwargs):
+        self.items.pop(self._clave(Key), None)
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues='NONE', **kwargs):
+        # Solo se soporta la forma 'SET a = :x, b = :y'
+        item = self.items.setdefault(self._clave(Key), dict(Key))
+        nuevos = {}
+        for campo, valor in re.findall(r'(\w+)\s*=\s*(:\w+)', UpdateExpression):
+            item[campo] = nuevos[campo] = ExpressionAttributeValues[valor]
+        if ReturnValues == 'ALL_NEW':
+            return {'Attributes': dict(item)}
+        if ReturnValues == 'UPDATED_NEW':
+            return {'Attributes': nuevos}
+        return {}
+
+    def scan(self, Limit=None, ExclusiveStartKey=None, **kwargs):
+        claves = list(self.items)
+        inicio = claves.index(self._clave(ExclusiveStartKey)) + 1 if ExclusiveStartKey else 0
+        fin = len(claves) if Limit is None else min(len(claves), inicio + Limit)
+        campos = campos_proyeccion(**kwargs)
+        items = [proyectar(self.items[c], campos) for c in claves[inicio:fin]]
+        respuesta = {'Items': items, 'Count': len(items), 'ScannedCount': len(items)}
+        if fin < len(claves):
+            respuesta['LastEvaluatedKey'] = dict(zip(self.claves, claves[fin - 1]))
+        return respuesta
+
+
+class RecursoLocal:
+    """Imita boto3.resource('dynamodb'): devuelve siempre la misma tabla por nombre."""
+
+    def __init__(self):
+        self.tablas = {}
+        # Número de próximas llamadas a batch_get_item que dejan la mitad de las claves en
+        # UnprocessedKeys, como cuando DynamoDB se satura (lo usa lambdas.comprobar_sin_procesar)
+        self.lotes_sin_procesar = 0
+
+    def Table(self, nombre):
+        if nombre not in self.tablas:
+            self.tablas[nombre] = TablaLocal(nombre)
+        return self.tablas[nombre]
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        if sum(len(pedido['Keys']) for pedido in RequestItems.values()) > 100:
+            raise ClientError({'Error': {'Code': 'ValidationException',
+                                         'Message': 'Too many items requested for the BatchGetItem call'}},
+                              'BatchGetItem')
+        respuestas, sin_procesar = {}, {}
+        for nombre, pedido in RequestItems.items():
+            claves = pedido['Keys']
+            opciones = {k: v for k, v in pedido.items() if k != 'Keys'}  # ProjectionExpression, etc.
+            if self.lotes_sin_procesar > 0 and len(claves) > 1:
+                self.lotes_sin_procesar -= 1
+                sin_procesar[nombre] = dict(opciones, Keys=claves[len(claves) // 2:])
+                claves = claves[:len(claves) // 2]
+            tabla, campos = self.Table(nombre), campos_proyeccion(**opciones)
+            encontrados = (tabla.items.get(tabla._clave(clave)) for clave in claves)
+            respuestas[nombre] = [proyectar(item, campos) for item in encontrados if item is not None]
+        return {'Responses': respuestas, 'UnprocessedKeys': sin_procesar}
+
+
+RECURSO = RecursoLocal()
+
+
+def instalar():
+    """Registra módulos falsos boto3/botocore para que los handlers se importen sin AWS."""
+    boto3 = types.ModuleType('boto3')
+    boto3.resource = lambda servicio, *args, **kwargs: RECURSO
+    botocore = types.ModuleType('botocore')
+    excepciones = types.ModuleType('botocore.exceptions')
+    excepciones.ClientError = ClientError
+    botocore.exceptions = excepciones
+    sys.modules.update({'boto3': boto3, 'botocore': botocore, 'botocore.exceptions': excepciones})
+    return RECURSO
@@ -0,0 +1,363 @@
+# Microbenchmarks de las funciones Lambda del repositorio.
+# Llama a lambda_handler en el mismo proceso con eventos sintéticos de API Gateway,
+# contra la tabla en memoria de dynamodb_local.py, y compara con baseline.json.
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import re
+import sys
+import statistics
+import time
+import tracemalloc
+import types
+
+import dynamodb_local
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Tolerancia por defecto: 25 % menos de operaciones/s o 25 % más de memoria pico
+UMBRAL = 0.25
+
+# Llamadas de la carga de referencia en cada repetición
+REFERENCIA_LLAMADAS = 500
+
+RECURSO = dynamodb_local.instalar()
+
+
+class Medidor:
+    """Acumula el tiempo gastado en cada fase (parse, almacenar, serializar)."""
+
+    def __init__(self):
+        self.fases = {'parse': 0.0, 'almacenar': 0.0, 'serializar': 0.0}
+
+    def medir(self, fase, funcion):
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self.fases[fase] += time.perf_counter() - inicio
+        return envoltura
+
+
+MEDIDOR = Medidor()
+
+
+class JsonMedido(types.ModuleType):
+    """Reemplaza el módulo json de cada handler para medir loads (parse) y dumps (serializar)."""
+
+    def __init__(self):
+        super().__init__('json')
+        self.__dict__.update(json.__dict__)
+        self.loads = MEDIDOR.medir('parse', json.loads)
+        self.dumps = MEDIDOR.medir('serializar', json.dumps)
+
+
+class TablaMedida:
+    """Envuelve una TablaLocal (o el recurso, por batch_get_item) para medir cada operación de almacenamiento."""
+
+    def __init__(self, tabla):
+        self._tabla = tabla
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._tabla, nombre)
+        return MEDIDOR.medir('almacenar', atributo) if callable(atributo) else atributo
+
+
+def _instrumentar(modulo):
+    modulo.json = JsonMedido()
+    for nombre in ('table', 'tabla', 'dynamodb'):
+        if hasattr(modulo, nombre):
+            setattr(modulo, nombre, TablaMedida(getattr(modulo, nombre)))
+    return modulo
+
+
+def cargar_archivo(ruta_relativa):
+    """Importa un handler desde un archivo .py del repositorio."""
+    ruta = os.path.join(RAIZ, ruta_relativa)
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    spec = importlib.util.spec_from_file_location(f'bench_{nombre}', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return _instrumentar(modulo)
+
+
+def cargar_markdown(ruta_relativa):
+    """Importa el primer bloque ```python con lambda_handler de una guía .md."""
+    with open(os.path.join(RAIZ, ruta_relativa), encoding='utf-8') as archivo:
+        texto = archivo.read()
+    bloques = re.findall(r'```python\n(.*?)```', texto, re.S)
+    codigo = next(b for b in bloques if 'def lambda_handler' in b)
+    modulo = types.ModuleType(f'bench_{os.path.basename(ruta_relativa)}')
+    exec(compile(codigo, ruta_relativa, 'exec'), modulo.__dict__)
+    return _instrumentar(modulo)
+
+
+def evento(metodo, ruta, cuerpo=None, parametros=None):
+    """Evento sintético de API Gateway."""
+    return {
+        'httpMethod': metodo,
+        'path': ruta,
+        'queryStringParameters': parametros,
+        'body': json.dumps(cuerpo) if isinstance(cuerpo, dict) else cuerpo,
+        'isBase64Encoded': False
+    }
+
+
+def usuarios(n, ancho=16):
+    return [{'id': str(i), 'nombre': f'Usuario {i}'.ljust(ancho, 'x'),
+             'correo': f'usuario{i}@ejemplo.com'} for i in range(n)]
+
+
+def items(n, atributos=5):
+    return [dict({'id': str(i)}, **{f'campo{j}': f'valor{j}' for j in range(atributos)})
+            for i in range(n)]
+
+
+def definir_casos():
+    """Devuelve la lista de escenarios: (nombre, handler, evento, tabla, items iniciales)."""
+    formulario = cargar_archivo('codigoclase/lambda_function.py')
+    insertar = cargar_archivo('codigoclase/InsertItemFunction.py')
+    consultar = cargar_archivo('codigoclase/GetItemFunction.py')
+    admin = cargar_markdown('AWS/APIRest.md')
+
+    casos = []
+    for ancho in (16, 1024, 65536):
+        casos.append((f'formulario_post_json_{ancho}B', formulario.lambda_handler,
+                      evento('POST', '/', {'nombre': 'x' * ancho, 'fecha': '2025-04-08'}),
+                      'FormularioData', []))
+    casos.append(('formulario_post_urlencoded', formulario.lambda_handler,
+                  evento('POST', '/', 'nombre=Ana&fecha=2025-04-08'), 'FormularioData', []))
+    casos.append(('formulario_get', formulario.lambda_handler,
+                  evento('GET', '/', parametros={'nombre': 'Ana', 'fecha': '2025-04-08'}),
+                  'FormularioData', []))
+    for atributos in (5, 50, 500):
+        casos.append((f'insert_item_{atributos}attr', insertar.lambda_handler,
+                      evento('POST', '/', {'item': items(1, atributos)[0]}), 'ItemsTable', []))
+    for filas in (10, 1000, 10000):
+        casos.append((f'get_items_{filas}', consultar.lambda_handler,
+                      evento('GET', '/'), 'ItemsTable', items(filas)))
+    # Items anchos: todos los atributos contra solo dos con ?fields= (ProjectionExpression)
+    casos.append(('get_items_1000_50attr', consultar.lambda_handler,
+                  evento('GET', '/'), 'ItemsTable', items(1000, 50)))
+    casos.append(('get_items_1000_50attr_fields', consultar.lambda_handler,
+                  evento('GET', '/', parametros={'fields': 'id,campo0'}), 'ItemsTable', items(1000, 50)))
+    for filas in (10, 1000, 10000):
+        casos.append((f'usuarios_listar_{filas}', admin.lambda_handler,
+                      evento('GET', '/usuarios'), 'Usuarios', usuarios(filas)))
+        casos.append((f'usuarios_listar_pagina100_{filas}', admin.lambda_handler,
+                      evento('GET', '/usuarios', parametros={'limite': '100'}), 'Usuarios', usuarios(filas)))
+    casos.append(('usuarios_listar_pagina100_fields_1000', admin.lambda_handler,
+                  evento('GET', '/usuarios', parametros={'limite': '100', 'fields': 'id,nombre'}),
+                  'Usuarios', usuarios(1000)))
+    casos.append(('usuarios_obtener', admin.lambda_handler,
+                  evento('GET', '/usuarios/5'), 'Usuarios', usuarios(1000)))
+    casos.append(('usuarios_obtener_varios_1000', admin.lambda_handler,
+                  evento('GET', '/usuarios', parametros={'ids': ','.join(str(i) for i in range(0, 2000, 2))}),
+                  'Usuarios', usuarios(1000)))
+    casos.append(('usuarios_crear', admin.lambda_handler,
+                  evento('POST', '/usuarios', {'id': '1', 'nombre': 'Ana', 'correo': 'ana@ejemplo.com'}),
+                  'Usuarios', []))
+    casos.append(('usuarios_actualizar', admin.lambda_handler,
+                  evento('PUT', '/usuarios', {'id': '1', 'nombre': 'Ana', 'correo': 'ana@ejemplo.com'}),
+                  'Usuarios', usuarios(10)))
+    return casos
+
+
+def comprobar_sin_procesar():
+    """
+    Comprueba (sin medir) los reintentos de obtener_varios en AWS/APIRest.md cuando
+    BatchGetItem devuelve UnprocessedKeys, usando RECURSO.lotes_sin_procesar.
+    Returns:
+        list: Descripción de cada comprobación que falló (vacía si todo está bien).
+    """
+    admin = cargar_markdown('AWS/APIRest.md')
+    esperas = []
+    admin.time = types.SimpleNamespace(sleep=esperas.append)  # Registra las esperas sin dormir
+    RECURSO.Table('Usuarios').items.clear()
+    RECURSO.Table('Usuarios').cargar(usuarios(150))
+    ids = [str(i) for i in range(160)]  # Dos lotes; los IDs 150-159 no existen
+    pedir = evento('GET', '/usuarios', parametros={'ids': ','.join(ids)})
+    fallos = []
+    try:
+        # Pocas respuestas incompletas: los reintentos recuperan todas las claves
+        RECURSO.lotes_sin_procesar = 3
+        cuerpo = json.loads(admin.lambda_handler(dict(pedir), None)['body'])
+        if [u['id'] for u in cuerpo['items']] != ids[:150] or cuerpo['faltantes'] != ids[150:]:
+            fallos.append('con reintentos suficientes no se devolvieron todos los usuarios en orden')
+        if cuerpo['sin_procesar']:
+            fallos.append(f"con reintentos suficientes quedaron sin procesar: {cuerpo['sin_procesar']}")
+        if len(esperas) != 3 or esperas != sorted(esperas):
+            fallos.append(f'las esperas entre reintentos no son crecientes: {esperas}')
+
+        # DynamoDB sigue saturado: lo que no se leyó va en sin_procesar, nunca como faltante
+        RECURSO.lotes_sin_procesar = 1_000_000
+        cuerpo = json.loads(admin.lambda_handler(dict(pedir), None)['body'])
+        leidos = [u['id'] for u in cuerpo['items']]
+        if not cuerpo['sin_procesar']:
+            fallos.append('con DynamoDB saturado sin_procesar quedó vacío')
+        if sorted(leidos + cuerpo['faltantes'] + cuerpo['sin_procesar'], key=int) != ids:
+            fallos.append('items, faltantes y sin_procesar no cubren exactamente los IDs pedidos')
+        if set(cuerpo['faltantes']) - set(ids[150:]):
+            fallos.append('IDs existentes reportados como faltantes')
+    finally:
+        RECURSO.lotes_sin_procesar = 0
+    return fallos
+
+
+def _referencia():
+    # Carga fija de Python puro (parse + serialización) para medir la velocidad del equipo
+    datos = json.loads(json.dumps([{'id': str(i), 'valor': i * 1.5} for i in range(20)]))
+    return sorted(d['id'] for d in datos)
+
+
+def medir_referencia(llamadas=REFERENCIA_LLAMADAS):
+    """Operaciones/s de la carga de referencia en este momento."""
+    inicio = time.perf_counter()
+    for _ in range(llamadas):
+        _referencia()
+    return llamadas / (time.perf_counter() - inicio)
+
+
+def ejecutar_caso(handler, evento_base, tabla, iniciales, tiempo_minimo=0.2, repeticiones=9):
+    """
+    Mide un escenario.
+    Returns:
+        dict: ops_s (mediana), relativo (ops_s / referencia del equipo),
+        microsegundos por fase por llamada y bytes_pico por llamada.
+    """
+    # Los handlers guardan la tabla al importarse, así que se vacía en lugar de reemplazarla
+    RECURSO.Table(tabla).items.clear()
+    RECURSO.Table(tabla).cargar(iniciales)
+
+    # Verificamos que el handler responda sin error antes de medir
+    respuesta = handler(dict(evento_base), None)
+    if respuesta.get('statusCode', 500) >= 500:
+        raise RuntimeError(f"El handler respondió {respuesta.get('statusCode')}: {respuesta.get('body')}")
+
+    # Calibramos cuántas llamadas caben en tiempo_minimo
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            handler(dict(evento_base), None)
+        if time.perf_counter() - inicio >= tiempo_minimo / 4 or llamadas >= 1_000_000:
+            break
+        llamadas *= 2
+
+    # Cada repetición mide el caso y enseguida la referencia; la proporción entre ambos
+    # compensa los cambios de velocidad del equipo. Se usa la mediana y sin recolector de basura.
+    tasas, relativos, fases = [], [], []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            MEDIDOR.fases = dict.fromkeys(MEDIDOR.fases, 0.0)
+            inicio = time.perf_counter()
+            for _ in range(llamadas):
+                handler(dict(evento_base), None)
+            tasa = llamadas / (time.perf_counter() - inicio)
+            tasas.append(tasa)
+            relativos.append(tasa / medir_referencia())
+            fases.append({f: t / llamadas * 1e6 for f, t in MEDIDOR.fases.items()})
+    finally:
+        gc.enable()
+
+    # Memoria: pico de asignaciones de una llamada (determinista, no depende del equipo)
+    tracemalloc.start()
+    handler(dict(evento_base), None)
+    tracemalloc.reset_peak()
+    antes = tracemalloc.get_traced_memory()[0]
+    handler(dict(evento_base), None)
+    bytes_pico = tracemalloc.get_traced_memory()[1] - antes
+    tracemalloc.stop()
+
+    resultado = {'ops_s': round(statistics.median(tasas), 1),
+                 'relativo': round(statistics.median(relativos), 5), 'bytes_pico': bytes_pico}
+    for fase in MEDIDOR.fases:
+        resultado[f'us_{fase}'] = round(statistics.median(f[fase] for f in fases), 2)
+    return resultado
+
+
+def comparar(resultados, baseline, umbral):
+    """Devuelve la lista de regresiones respecto al baseline."""
+    regresiones = []
+    for nombre, actual in resultados.items():
+        base = baseline.get(nombre)
+        if not base:
+            continue
+        # Se compara el rendimiento relativo a la referencia, no las ops/s absolutas del equipo
+        if actual['relativo'] < base['relativo'] * (1 - umbral):
+            regresiones.append(f"{nombre}: {actual['relativo'] / base['relativo'] - 1:+.0%} de rendimiento "
+                               f"({actual['ops_s']:,.0f} ops/s)")
+        if actual['bytes_pico'] > base['bytes_pico'] * (1 + umbral) + 1024:
+            regresiones.append(f"{nombre}: {actual['bytes_pico']:,} B pico (baseline {base['bytes_pico']:,})")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks de los handlers Lambda')
+    parser.add_argument('--guardar', action='store_true', help='Guarda los resultados como nuevo baseline')
+    parser.add_argument('--umbral', type=float, default=None,
+                        help=f'Regresión tolerada (fracción, por defecto la de baseline.json o {UMBRAL})')
+    parser.add_argument('--filtro', default='', help='Ejecuta solo los casos que contienen este texto')
+    parser.add_argument('--tiempo', type=float, default=0.2, help='Segundos mínimos por repetición')
+    args = parser.parse_args()
+
+    baseline = {}
+    umbral = UMBRAL
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        baseline = datos.get('casos', {})
+        umbral = datos.get('umbral', UMBRAL)
+    if args.umbral is not None:
+        umbral = args.umbral
+
+    fallos = comprobar_sin_procesar()
+    if fallos:
+        print("Fallan los reintentos de BatchGetItem (UnprocessedKeys):")
+        for linea in fallos:
+            print(f"- {linea}")
+        sys.exit(1)
+    print("Reintentos de BatchGetItem (UnprocessedKeys): correctos\n")
+
+    resultados = {}
+    print(f"{'caso':<34}{'ops/s':>12}{'parse µs':>10}{'store µs':>10}{'serial µs':>11}{'pico KB':>10}{'vs base':>9}")
+    for nombre, handler, evento_base, tabla, iniciales in definir_casos():
+        if args.filtro not in nombre:
+            continue
+        r = ejecutar_caso(handler, evento_base, tabla, iniciales, tiempo_minimo=args.tiempo)
+        if not args.guardar and comparar({nombre: r}, baseline, umbral):
+            # Se repite una vez antes de reportar la regresión, por si fue ruido del equipo
+            otra = ejecutar_caso(handler, evento_base, tabla, iniciales, tiempo_minimo=args.tiempo)
+            r = max(r, otra, key=lambda x: x['relativo'])
+        resultados[nombre] = r
+        base = baseline.get(nombre)
+        cambio = f"{(r['relativo'] / base['relativo'] - 1) * 100:+.0f}%" if base else 'nuevo'
+        print(f"{nombre:<34}{r['ops_s']:>12,.0f}{r['us_parse']:>10.1f}{r['us_almacenar']:>10.1f}"
+              f"{r['us_serializar']:>11.1f}{r['bytes_pico'] / 1024:>10.1f}{cambio:>9}")
+
+    if args.guardar:
+        casos = dict(baseline, **resultados)
+        with open(BASELINE, 'w', encoding='utf-8') as archivo:
+            json.dump({'umbral': umbral, 'python': sys.version.split()[0], 'casos': casos},
+                      archivo, indent=2, sort_keys=True)
+            archivo.write('\n')
+        print(f"Baseline guardado en {BASELINE}")
+        return
+
+    regresiones = comparar(resultados, baseline, umbral)
+    if regresiones:
+        print(f"\nRegresiones mayores al {umbral:.0%}:")
+        for linea in regresiones:
+            print(f"- {linea}")
+        sys.exit(1)
+    print("\nSin regresiones.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# Importamos las bibliotecas necesarias
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Columnas que produce generar_transaccion() en datosDummis.py
+# (fechaHora solo existe en los datos exportados desde la tabla)
+COLUMNAS = ['idTransaccion', 'idCuenta', 'monto', 'tipo', 'descripcion', 'fechaHora']
+
+# Tipos que cuentan en el saldo: los depósitos suman y los retiros restan
+TIPOS = ('DEPOSITO', 'RETIRO')
+
+# Tamaño de bloque por defecto: filas que se procesan a la vez en memoria
+TAMANO_BLOQUE = 200_000
+
+# Archivo que lee el tablero de gráficos (relativo a este script, no a la carpeta actual)
+SALIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'html', '4gráficos', 'datos.json')
+
+
+def leer_bloques(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Lee un archivo de transacciones por bloques para no cargarlo completo en memoria.
+    Args:
+        ruta (str): Archivo .jsonl/.json (una transacción por línea) o .parquet.
+        tamano_bloque (int): Número de filas por bloque.
+    Returns:
+        generator: DataFrames de pandas con como máximo tamano_bloque filas.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.parquet':
+        try:
+            import pyarrow.parquet as pq  # Dependencia opcional solo para Parquet
+        except ImportError:
+            raise SystemExit("Error: para leer Parquet instale pyarrow (pip install pyarrow).")
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tamano_bloque):
+            yield lote.to_pandas()
+    else:
+        # lines=True + chunksize lee el JSONL de forma incremental
+        with pd.read_json(ruta, lines=True, chunksize=tamano_bloque, dtype=False) as lector:
+            for bloque in lector:
+                yield bloque
+
+
+def normalizar_bloque(bloque):
+    """
+    Deja un bloque con tipos homogéneos y agrega la columna 'neto' (monto con signo).
+    Args:
+        bloque (DataFrame): Transacciones tal como se leyeron del archivo.
+    Returns:
+        DataFrame: Bloque normalizado.
+    """
+    bloque = bloque.reindex(columns=[c for c in COLUMNAS if c in bloque.columns])
+    bloque['monto'] = pd.to_numeric(bloque['monto'], errors='coerce').fillna(0.0)
+    bloque['tipo'] = bloque['tipo'].astype(str).str.upper()
+    # Depósitos suman al saldo y retiros restan, sin recorrer fila por fila; cualquier otro tipo
+    # no cambia el saldo (tampoco aparece en los totales de depósitos y retiros)
+    bloque['neto'] = np.select([bloque['tipo'] == 'DEPOSITO', bloque['tipo'] == 'RETIRO'],
+                               [bloque['monto'], -bloque['monto']], default=0.0)
+    if 'fechaHora' in bloque.columns:
+        # format='ISO8601' acepta fechas con y sin microsegundos o zona horaria en el mismo bloque;
+        # sin él pandas infiere el formato de la primera fila y descarta (NaT) las demás
+        fechas = pd.to_datetime(bloque['fechaHora'], errors='coerce', utc=True, format='ISO8601')
+        # Truncar a mes con numpy es mucho más rápido que formatear cada fecha como texto
+        bloque['mes'] = fechas.dt.tz_convert(None).to_numpy().astype('datetime64[M]')
+    return bloque
+
+
+class Acumulador:
+    """Agrega los resultados parciales de cada bloque."""
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.filas = 0
+        self.fechas_invalidas = 0  # Filas con fechaHora que no se pudo interpretar
+        self.tipos_desconocidos = 0  # Filas cuyo tipo no es DEPOSITO ni RETIRO
+        self.por_cuenta = None  # DataFrame idCuenta x [DEPOSITO, RETIRO, saldo]
+        self.por_mes = None  # DataFrame mes x [DEPOSITO, RETIRO]
+        self.top = None  # DataFrame con los top_n montos vistos hasta ahora
+
+    @staticmethod
+    def _sumar(actual, parcial):
+        # Suma dos tablas parciales alineando índices y columnas
+        if actual is None:
+            return parcial
+        return actual.add(parcial, fill_value=0)
+
+    def agregar(self, bloque):
+        """Incorpora un bloque normalizado a los totales."""
+        self.filas += len(bloque)
+        self.tipos_desconocidos += int((~bloque['tipo'].isin(TIPOS)).sum())
+
+        # Totales por cuenta y tipo en una sola agrupación
+        tipos = bloque.pivot_table(index='idCuenta', columns='tipo', values='monto',
+                                   aggfunc='sum', fill_value=0)
+        tipos['saldo'] = bloque.groupby('idCuenta')['neto'].sum()
+        self.por_cuenta = self._sumar(self.por_cuenta, tipos)
+
+        # Serie mensual (solo si el archivo trae fechaHora)
+        if 'mes' in bloque.columns:
+            self.fechas_invalidas += int((bloque['mes'].isna() & bloque['fechaHora'].notna()).sum())
+            mensual = bloque.dropna(subset=['mes']).pivot_table(
+                index='mes', columns='tipo', values='monto', aggfunc='sum', fill_value=0)
+            self.por_mes = self._sumar(self.por_mes, mensual)
+
+        # Top-N: basta con conservar los N mayores de cada bloque
+        columnas_top = [c for c in ('idTransaccion', 'idCuenta', 'monto', 'tipo', 'fechaHora')
+                        if c in bloque.columns]
+        candidatos = bloque.nlargest(self.top_n, 'monto')[columnas_top]
+        if self.top is not None:
+            candidatos = pd.concat([self.top, candidatos], ignore_index=True)
+        self.top = candidatos.nlargest(self.top_n, 'monto').reset_index(drop=True)
+
+    def resultado(self):
+        """
+        Construye el diccionario final de métricas.
+        Returns:
+            dict: saldos, totales, serie mensual y top-N listos para serializar.
+        """
+        por_cuenta = self.por_cuenta if self.por_cuenta is not None else pd.DataFrame()
+        por_cuenta = por_cuenta.reindex(columns=['DEPOSITO', 'RETIRO', 'saldo'], fill_value=0)
+        por_cuenta = por_cuenta.sort_index()
+
+        resultado = {
+            'filas': self.filas,
+            'fechas_invalidas': self.fechas_invalidas,
+            'tipos_desconocidos': self.tipos_desconocidos,
+            'cuentas': {
+                cuenta: {
+                    'depositos': float(fila['DEPOSITO']),
+                    'retiros': float(fila['RETIRO']),
+                    'saldo': float(fila['saldo'])
+                }
+                for cuenta, fila in por_cuenta.iterrows()
+            },
+            'totales': {
+                'depositos': float(por_cuenta['DEPOSITO'].sum()),
+                'retiros': float(por_cuenta['RETIRO'].sum())
+            },
+            'mensual': {},
+            'top': [] if self.top is None else json.loads(self.top.to_json(orient='records'))
+        }
+        if self.por_mes is not None:
+            por_mes = self.por_mes.reindex(columns=['DEPOSITO', 'RETIRO'], fill_value=0).sort_index()
+            resultado['mensual'] = {
+                'meses': list(pd.DatetimeIndex(por_mes.index).strftime('%Y-%m')),
+                'depositos': por_mes['DEPOSITO'].astype(float).tolist(),
+                'retiros': por_mes['RETIRO'].astype(float).tolist()
+            }
+        return resultado
+
+
+def analizar(ruta, tamano_bloque=TAMANO_BLOQUE, top_n=10):
+    """
+    Recorre el archivo por bloques y calcula las métricas de las transacciones.
+    Args:
+        ruta (str): Archivo de transacciones (.jsonl o .parquet).
+        tamano_bloque (int): Filas por bloque.
+        top_n (int): Cantidad de montos más altos a reportar.
+    Returns:
+        tuple: (dict con las métricas, segundos transcurridos)
+    """
+    acumulador = Acumulador(top_n=top_n)
+    inicio = time.perf_counter()
+    for bloque in leer_bloques(ruta, tamano_bloque):
+        acumulador.agregar(normalizar_bloque(bloque))
+        transcurrido = time.perf_counter() - inicio
+        print(f"\r{acumulador.filas:,} filas - {acumulador.filas / max(transcurrido, 1e-9):,.0f} filas/s",
+              end='', flush=True)
+    print()
+    return acumulador.resultado(), time.perf_counter() - inicio
+
+
+def datos_graficos(resultado):
+    """
+    Convierte las métricas al formato que lee caso1/html/4gráficos/script.js.
+    Args:
+        resultado (dict): Métricas devueltas por analizar().
+    Returns:
+        dict: labels/datos para los gráficos y la serie mensual si existe.
+    """
+    cuentas = resultado['cuentas']
+    return {
+        'titulo': 'Saldo por cuenta',
+        'labels': list(cuentas.keys()),
+        'datos': [round(c['saldo'], 2) for c in cuentas.values()],
+        'mensual': resultado['mensual'],
+        'top': resultado['top']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analítica por bloques de transacciones exportadas')
+    parser.add_argument('archivo', help='Archivo de transacciones (.jsonl o .parquet)')
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE, help='Filas por bloque')
+    parser.add_argument('--top', type=int, default=10, help='Cantidad de montos más altos a reportar')
+    parser.add_argument('--salida', default=SALIDA,
+                        help='Archivo JSON que consume el tablero de gráficos')
+    args = parser.parse_args()
+
+    resultado, segundos = analizar(args.archivo, args.bloque, args.top)
+
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(datos_graficos(resultado), archivo, ensure_ascii=False, indent=2)
+
+    print(f"Filas procesadas: {resultado['filas']:,} en {segundos:.2f} s "
+          f"({resultado['filas'] / max(segundos, 1e-9):,.0f} filas/s)")
+    if resultado['tipos_desconocidos']:
+        print(f"Advertencia: {resultado['tipos_desconocidos']:,} filas con un tipo distinto de "
+              f"DEPOSITO o RETIRO no se sumaron al saldo")
+    if resultado['fechas_invalidas']:
+        print(f"Advertencia: {resultado['fechas_invalidas']:,} filas con fechaHora no válida "
+              f"quedaron fuera de la serie mensual")
+    print(f"Depósitos: {resultado['totales']['depositos']:,.2f} - Retiros: {resultado['totales']['retiros']:,.2f}")
+    for cuenta, valores in resultado['cuentas'].items():
+        print(f"- {cuenta}: saldo {valores['saldo']:,.2f}")
+    print(f"Datos de gráficos guardados en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
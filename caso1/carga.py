@@ -0,0 +1,224 @@
+# Modelo de carga para las pruebas de datosDummis.py: universo grande de cuentas con sesgo
+# (Zipf o cuentas calientes), distribución de montos, ráfagas según la hora del día y
+# llegadas en lazo abierto (Poisson o tasa constante).
+import bisect
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Multiplicador de la tasa por hora del día (0-23): poco tráfico de noche, picos en la
+# mañana, al mediodía y al final de la tarde (pagos de nómina y servicios)
+PERFIL_HORARIO_BANCO = (
+    0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 0.8, 1.5, 2.5, 3.0, 2.8, 2.2,
+    2.6, 2.4, 1.8, 1.6, 1.8, 2.6, 2.8, 2.0, 1.4, 1.0, 0.6, 0.3
+)
+
+# Perfiles predefinidos (argumentos de ModeloCarga)
+PERFILES = {
+    # Igual al comportamiento original: 4 cuentas, montos uniformes y 2 transacciones por segundo
+    'demo': {'cuentas': 4, 'sesgo': 'uniforme', 'montos': 'uniforme', 'tasa': 2, 'proceso': 'constante'},
+    # 100.000 cuentas con popularidad Zipf: pocas cuentas concentran gran parte del tráfico
+    'zipf': {'cuentas': 100_000, 'sesgo': 'zipf', 'exponente': 1.1, 'montos': 'lognormal',
+             'tasa': 20, 'proceso': 'poisson'},
+    # 1 % de las cuentas recibe la mitad de las transacciones (partición caliente)
+    'caliente': {'cuentas': 100_000, 'sesgo': 'caliente', 'fraccion_caliente': 0.01, 'peso_caliente': 0.5,
+                 'montos': 'lognormal', 'tasa': 20, 'proceso': 'poisson'},
+    # Zipf con ráfagas horarias: un día completo comprimido en 10 minutos
+    'diario': {'cuentas': 100_000, 'sesgo': 'zipf', 'exponente': 1.1, 'montos': 'pareto',
+               'tasa': 10, 'proceso': 'poisson', 'perfil_horario': PERFIL_HORARIO_BANCO,
+               'duracion_dia': 600},
+}
+
+
+class UniversoCuentas:
+    """
+    Conjunto de cuentas CUENTA000001 ... CUENTAnnnnnn con una probabilidad de uso por cuenta.
+    No guarda la lista de cuentas: los identificadores se generan a partir del número.
+    - sesgo: 'uniforme', 'zipf' (probabilidad proporcional a 1 / rango^exponente) o
+      'caliente' (fraccion_caliente de las cuentas recibe peso_caliente del tráfico).
+    """
+
+    def __init__(self, cuentas, sesgo='uniforme', exponente=1.1, fraccion_caliente=0.01,
+                 peso_caliente=0.5, rng=None):
+        if cuentas <= 0:
+            raise ValueError("El universo debe tener al menos una cuenta")
+        self.total = cuentas
+        self.sesgo = sesgo
+        self.rng = rng or random.Random()
+        self.digitos = max(6, len(str(cuentas)))
+        if sesgo == 'zipf':
+            # Pesos acumulados una sola vez; cada elección es una búsqueda binaria
+            acumulado, self._acumulados = 0.0, []
+            for rango in range(1, cuentas + 1):
+                acumulado += 1.0 / rango ** exponente
+                self._acumulados.append(acumulado)
+        elif sesgo == 'caliente':
+            self.calientes = max(1, int(cuentas * fraccion_caliente))
+            self.peso_caliente = peso_caliente
+        elif sesgo != 'uniforme':
+            raise ValueError(f"Sesgo no soportado: {sesgo}")
+
+    def cuenta(self, numero):
+        return f"CUENTA{numero:0{self.digitos}d}"
+
+    def elegir(self):
+        """Devuelve el identificador de una cuenta según la distribución del universo."""
+        if self.sesgo == 'zipf':
+            objetivo = self.rng.random() * self._acumulados[-1]
+            numero = bisect.bisect_left(self._acumulados, objetivo) + 1
+        elif self.sesgo == 'caliente' and self.rng.random() < self.peso_caliente:
+            numero = self.rng.randint(1, self.calientes)
+        else:
+            numero = self.rng.randint(1, self.total)
+        return self.cuenta(numero)
+
+    def __contains__(self, id_cuenta):
+        # Permite validar con `id_cuenta in universo` sin recorrer las cuentas
+        if not isinstance(id_cuenta, str) or not id_cuenta.startswith('CUENTA'):
+            return False
+        numero = id_cuenta[len('CUENTA'):]
+        return len(numero) == self.digitos and numero.isdigit() and 1 <= int(numero) <= self.total
+
+    def __len__(self):
+        return self.total
+
+
+class ModeloCarga:
+    """
+    Genera transacciones y los instantes en que deberían enviarse.
+    - cuentas, sesgo, exponente, fraccion_caliente, peso_caliente: ver UniversoCuentas.
+    - montos: 'uniforme' (entre monto_minimo y monto_maximo), 'lognormal' (mediana monto_mediana,
+      dispersión sigma) o 'pareto' (mínimo monto_minimo, forma alfa; cola larga de montos grandes).
+    - tasa: Transacciones por segundo (antes de aplicar el perfil horario).
+    - proceso: 'poisson' (tiempos entre llegadas exponenciales) o 'constante'.
+    - perfil_horario: 24 multiplicadores de la tasa; duracion_dia: segundos reales que dura un día simulado.
+    - semilla: Para repetir exactamente la misma carga.
+    """
+
+    def __init__(self, cuentas=4, sesgo='uniforme', exponente=1.1, fraccion_caliente=0.01, peso_caliente=0.5,
+                 montos='uniforme', monto_minimo=1000, monto_maximo=10_000_000, monto_mediana=150_000,
+                 sigma=1.2, alfa=1.5, tasa=2, proceso='poisson', perfil_horario=None, duracion_dia=86_400,
+                 hora_inicio=0, tipos=('DEPOSITO', 'RETIRO'), descripciones=('Depósito inicial',), semilla=None):
+        if montos not in ('uniforme', 'lognormal', 'pareto'):
+            raise ValueError(f"Distribución de montos no soportada: {montos}")
+        if proceso not in ('poisson', 'constante'):
+            raise ValueError(f"Proceso de llegadas no soportado: {proceso}")
+        if tasa <= 0:
+            raise ValueError("La tasa debe ser positiva")
+        self.rng = random.Random(semilla)
+        self.cuentas = UniversoCuentas(cuentas, sesgo, exponente, fraccion_caliente, peso_caliente, self.rng)
+        self.montos = montos
+        self.monto_minimo, self.monto_maximo = monto_minimo, monto_maximo
+        self.monto_mediana, self.sigma, self.alfa = monto_mediana, sigma, alfa
+        self.tasa = tasa
+        self.proceso = proceso
+        self.perfil_horario = perfil_horario
+        self.duracion_dia = duracion_dia
+        self.hora_inicio = hora_inicio
+        self.tipos = list(tipos)
+        self.descripciones = list(descripciones)
+
+    def generar_monto(self):
+        if self.montos == 'lognormal':
+            monto = self.rng.lognormvariate(math.log(self.monto_mediana), self.sigma)
+        elif self.montos == 'pareto':
+            monto = self.monto_minimo * self.rng.paretovariate(self.alfa)
+        else:
+            return self.rng.randint(self.monto_minimo, self.monto_maximo)
+        return max(1, min(int(monto), self.monto_maximo))
+
+    def generar_transaccion(self):
+        """Transacción con los mismos campos que datosDummis.generar_transaccion()."""
+        return {
+            'idTransaccion': str(uuid.uuid4()),
+            'idCuenta': self.cuentas.elegir(),
+            'monto': self.generar_monto(),
+            'tipo': self.rng.choice(self.tipos),
+            'descripcion': self.rng.choice(self.descripciones)
+        }
+
+    def multiplicador(self, segundos):
+        # Factor de la hora simulada que corresponde a `segundos` desde el inicio de la prueba
+        if not self.perfil_horario:
+            return 1.0
+        hora = (self.hora_inicio + segundos / self.duracion_dia * 24) % 24
+        return self.perfil_horario[int(hora)]
+
+    def instantes(self, n):
+        """Genera n instantes de envío (segundos desde el inicio), independientes de las respuestas."""
+        t = 0.0
+        for _ in range(n):
+            tasa = self.tasa * self.multiplicador(t)
+            t += self.rng.expovariate(tasa) if self.proceso == 'poisson' else 1.0 / tasa
+            yield t
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def ejecutar_abierto(modelo, enviar, n, telemetria=None, hilos=32):
+    """
+    Envía n transacciones en lazo abierto: cada una sale en su instante programado aunque las
+    anteriores no hayan respondido. La latencia se mide desde el instante programado (no desde
+    que el hilo pudo enviarla), así las esperas por saturación cuentan y no se ocultan
+    (omisión coordinada).
+    - modelo: ModeloCarga.
+    - enviar: Función que recibe la transacción y devuelve la respuesta o None si falla
+      (si lanza una excepción también cuenta como fallo).
+    - telemetria: Telemetria opcional que recibe (éxito, latencia desde el instante programado).
+    Returns:
+        dict: enviadas, éxitos, errores (envíos que lanzaron excepción), p50/p99 desde el instante programado y de servicio, y el
+        atraso máximo del generador (si es alto, la máquina cliente no alcanzó la tasa pedida).
+    """
+    desde_programado, servicio, exitos, errores, atraso_maximo = [], [], [0], [0], 0.0
+    candado = threading.Lock()
+
+    def tarea(transaccion, programado):
+        salida = time.perf_counter()
+        try:
+            respuesta = enviar(transaccion)
+            excepcion = False
+        except Exception:
+            # Una excepción (p. ej. un 2xx con cuerpo que no es JSON) cuenta como fallo; si no,
+            # el ejecutor la guardaría en silencio y la transacción no aparecería en el resumen
+            respuesta, excepcion = None, True
+        fin = time.perf_counter()
+        with candado:
+            desde_programado.append(fin - programado)
+            servicio.append(fin - salida)
+            if respuesta is not None:
+                exitos[0] += 1
+            if excepcion:
+                errores[0] += 1
+        if telemetria:
+            telemetria.registrar(respuesta is not None, fin - programado)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        for desfase in modelo.instantes(n):
+            programado = inicio + desfase
+            espera = programado - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                atraso_maximo = max(atraso_maximo, -espera)
+            ejecutor.submit(tarea, modelo.generar_transaccion(), programado)
+
+    return {
+        'enviadas': len(desde_programado),
+        'exitos': exitos[0],
+        'errores': errores[0],
+        'duracion': time.perf_counter() - inicio,
+        'p50': percentil(desde_programado, 50),
+        'p99': percentil(desde_programado, 99),
+        'p50_servicio': percentil(servicio, 50),
+        'p99_servicio': percentil(servicio, 99),
+        'atraso_maximo': atraso_maximo
+    }
@@ -5,21 +5,50 @@ import json
 import time
 import logging
 import uuid
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 from decimal import Decimal
 
-# Configuramos el registro de errores en un archivo
-logging.basicConfig(
-    filename='errores.log',
-    level=logging.ERROR,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+from captura import hooks_desde_entorno
+from carga import ModeloCarga, PERFILES, ejecutar_abierto
+from registro import configurar_registro
+from telemetria import Telemetria
+
+# Configuramos el registro de errores en un archivo (JSON Lines, escrito en segundo plano).
+# Los errores repetidos se agrupan cada 10 s; MUESTREO_ERRORES indica qué fracción
+# de las repeticiones se escribe completa además del resumen.
+MUESTREO_ERRORES = 0.0
+configurar_registro(
+    archivo='errores.log',
+    nivel=logging.ERROR,
+    ventana=10,
+    muestreo=MUESTREO_ERRORES
 )
 
+# Captura de tráfico (se activa con la variable de entorno CAPTURA_TRAFICO=archivo.jsonl)
+HOOKS_CAPTURA = hooks_desde_entorno()
+
 # URL base del API Gateway
 API_BASE_URL = "https://w5iesrsclb.execute-api.us-east-1.amazonaws.com/transacciones"
 # Lista de cuentas ficticias para los datos de demostración
 CUENTAS = ["CUENTA123", "CUENTA456", "CUENTA789", "CUENTA101"]
 
+# Solicitudes cubiertas (hedged): si la respuesta tarda más que el p95 reciente,
+# se envía un duplicado y se usa la primera respuesta. Es seguro porque el servidor
+# no inserta dos veces el mismo idTransaccion.
+SOLICITUDES_CUBIERTAS = False
+RETRASO_COBERTURA_INICIAL = 1.0  # Segundos antes de cubrir mientras no hay suficientes muestras
+LATENCIAS = deque(maxlen=500)  # Latencias recientes de envíos exitosos (segundos)
+
+# Modo silencioso: en lugar de una línea por transacción se muestra una sola línea de estado
+# (tasa, éxitos/fallos, p50/p99 y tiempo restante) que se actualiza varias veces por segundo.
+MODO_SILENCIOSO = False
+# Archivo de métricas que se reescribe durante la carga: .prom (formato de texto de Prometheus)
+# o .json. None desactiva la exportación.
+ARCHIVO_METRICAS = None
+
 # Lista de tipos de transacciones posibles
 TIPOS_TRANSACCION = ["DEPOSITO", "RETIRO"]
 
@@ -32,43 +61,44 @@ DESCRIPCIONES = [
     "Depósito por nómina"
 ]
 
-def validar_transaccion(transaccion):
+def validar_transaccion(transaccion, cuentas=None):
     """
     Valida que la transacción tenga los campos requeridos y valores válidos.
     Args:
         transaccion (dict): Diccionario con los datos de la transacción.
+        cuentas: Cuentas válidas (lista o UniversoCuentas); por defecto CUENTAS.
     Returns:
         bool: True si es válida, False si no lo es.
     """
     try:
         # Verificamos que todos los campos necesarios estén presentes
         if not all(key in transaccion for key in ['idCuenta', 'monto', 'tipo', 'descripcion']):
-            logging.error(f"Transacción inválida: faltan campos - {transaccion}")
+            logging.error("Transacción inválida: faltan campos - %s", transaccion)
             return False
         
         # Validamos idCuenta
-        if transaccion['idCuenta'] not in CUENTAS:
-            logging.error(f"Transacción inválida: idCuenta no válido - {transaccion['idCuenta']}")
+        if transaccion['idCuenta'] not in (CUENTAS if cuentas is None else cuentas):
+            logging.error("Transacción inválida: idCuenta no válido - %s", transaccion['idCuenta'])
             return False
         
         # Validamos monto (positivo y numérico)
         if not isinstance(transaccion['monto'], (int, float)) or transaccion['monto'] <= 0:
-            logging.error(f"Transacción inválida: monto no válido - {transaccion['monto']}")
+            logging.error("Transacción inválida: monto no válido - %s", transaccion['monto'])
             return False
         
         # Validamos tipo
         if transaccion['tipo'] not in TIPOS_TRANSACCION:
-            logging.error(f"Transacción inválida: tipo no válido - {transaccion['tipo']}")
+            logging.error("Transacción inválida: tipo no válido - %s", transaccion['tipo'])
             return False
         
         # Validamos descripcion (no vacía)
         if not transaccion['descripcion']:
-            logging.error(f"Transacción inválida: descripción vacía - {transaccion}")
+            logging.error("Transacción inválida: descripción vacía - %s", transaccion)
             return False
             
         return True
     except Exception as e:
-        logging.error(f"Error al validar transacción: {str(e)} - {transaccion}")
+        logging.error("Error al validar transacción: %s - %s", e, transaccion)
         return False
 
 def generar_transaccion():
@@ -97,20 +127,25 @@ def enviar_transaccion(transaccion, intentos_max=3, pausa_entre_intentos=1):
     for intento in range(intentos_max):
         try:
             # Enviamos la solicitud POST
+            inicio = time.perf_counter()
             response = requests.post(
                 API_BASE_URL,
                 headers={"Content-Type": "application/json"},
                 data=json.dumps(transaccion),
-                timeout=10  # Tiempo máximo de espera
+                timeout=10,  # Tiempo máximo de espera
+                hooks=HOOKS_CAPTURA  # Registra la solicitud si la captura está activa
             )
             
-            # Verificamos el código de estado
-            if response.status_code == 201:
+            # Verificamos el código de estado (200 = la transacción ya estaba registrada)
+            if response.status_code in (200, 201):
+                LATENCIAS.append(time.perf_counter() - inicio)
                 return response.json()
             else:
-                # Registramos el error con detalles
+                # Registramos el error con detalles (agrupado por código de estado)
                 logging.error(
-                    f"Intento {intento+1} fallido: Código {response.status_code} - {response.text}"
+                    "Intento %d fallido: Código %s - %s",
+                    intento + 1, response.status_code, response.text,
+                    extra={'clave': response.status_code}
                 )
                 if response.status_code in [400, 403, 404]:  # Errores no recuperables
                     return None
@@ -120,48 +155,262 @@ def enviar_transaccion(transaccion, intentos_max=3, pausa_entre_intentos=1):
                 
         except requests.exceptions.RequestException as e:
             # Registramos errores de conexión
-            logging.error(f"Intento {intento+1} fallido: Error de conexión - {str(e)}")
+            logging.error(
+                "Intento %d fallido: Error de conexión - %s", intento + 1, e,
+                extra={'clave': type(e).__name__}
+            )
             if intento < intentos_max - 1:
                 time.sleep(pausa_entre_intentos)
     
     return None
 
-def insertar_datos(n):
+def retraso_cobertura(percentil=95, minimo_muestras=20):
+    """
+    Calcula cuánto esperar antes de enviar el duplicado de una solicitud.
+    Returns:
+        float: Percentil de las latencias recientes, o RETRASO_COBERTURA_INICIAL si hay pocas muestras.
+    """
+    muestras = sorted(LATENCIAS)
+    if len(muestras) < minimo_muestras:
+        return RETRASO_COBERTURA_INICIAL
+    return muestras[min(len(muestras) - 1, int(len(muestras) * percentil / 100))]
+
+def enviar_transaccion_cubierta(transaccion, retraso=None):
+    """
+    Envía una transacción y, si sigue sin respuesta tras `retraso` segundos (p95 por defecto),
+    envía la misma transacción otra vez. Gana la primera respuesta exitosa; como ambas
+    llevan el mismo idTransaccion, el servidor guarda una sola.
+    Args:
+        transaccion (dict): Diccionario con los datos de la transacción (con idTransaccion).
+        retraso (float): Segundos antes de enviar el duplicado; por defecto retraso_cobertura().
+    Returns:
+        dict: Respuesta del servidor o None si ambos envíos fallan.
+    """
+    if retraso is None:
+        retraso = retraso_cobertura()
+    # Cada envío corre en su propio hilo (sin un grupo compartido que limite cuántos salen a la
+    # vez), así el reloj de la cobertura empieza cuando la principal sale de verdad
+    respuestas = queue.Queue()
+
+    def enviar():
+        try:
+            respuestas.put(enviar_transaccion(transaccion))
+        except Exception as e:
+            # Sin esto el hilo que espera en la cola no recibiría nunca la respuesta
+            logging.error("Envío cubierto fallido: %s", e, extra={'clave': type(e).__name__})
+            respuestas.put(None)
+
+    threading.Thread(target=enviar, daemon=True).start()
+    try:
+        # Si la principal terminó a tiempo se usa su resultado, aunque haya fallado: un error
+        # no recuperable (400/403/404) no mejora enviando un duplicado
+        return respuestas.get(timeout=retraso)
+    except queue.Empty:
+        pass
+
+    # La principal sigue pendiente: enviamos el duplicado y gana la primera respuesta exitosa
+    threading.Thread(target=enviar, daemon=True).start()
+    for _ in range(2):
+        respuesta = respuestas.get()
+        if respuesta is not None:
+            return respuesta  # La otra solicitud termina en segundo plano
+    return None
+
+def insertar_datos(n, silencioso=None, archivo_metricas=None):
     """
     Inserta n transacciones de demostración usando el endpoint POST /transacciones.
     Args:
         n (int): Número de transacciones a insertar.
+        silencioso (bool): Muestra solo la línea de estado; por defecto MODO_SILENCIOSO.
+        archivo_metricas (str): Archivo .prom o .json de métricas; por defecto ARCHIVO_METRICAS.
     """
+    silencioso = MODO_SILENCIOSO if silencioso is None else silencioso
     print(f"Iniciando inserción de {n} transacciones de demostración...")
     
-    for i in range(n):
-        # Generamos una transacción
-        transaccion = generar_transaccion()
-        #print(transaccion)
-        
-        # Validamos la transacción
-        if not validar_transaccion(transaccion):
-            print(f"Transacción {i+1} inválida, omitida. Ver errores.log.")
-            continue
-        
-        # Enviamos la transacción con reintentos
-        respuesta = enviar_transaccion(transaccion)
-        
-        if respuesta:
-            print(f"Transacción {i+1} insertada: {respuesta['idTransaccion']}")
-        else:
-            print(f"Error en transacción {i+1}: No se pudo insertar. Ver errores.log.")
-        
-        # Pausa para evitar límites de tasa
-        time.sleep(0.5)
+    with Telemetria(total=n, nombre='transacciones', mostrar=silencioso,
+                    archivo_metricas=archivo_metricas or ARCHIVO_METRICAS) as telemetria:
+        for i in range(n):
+            # Generamos una transacción
+            transaccion = generar_transaccion()
+            #print(transaccion)
+            
+            # Validamos la transacción
+            if not validar_transaccion(transaccion):
+                telemetria.registrar(False)  # Fallo sin muestra de latencia: no se envió
+                if not silencioso:
+                    print(f"Transacción {i+1} inválida, omitida. Ver errores.log.")
+                continue
+            
+            # Enviamos la transacción con reintentos (y con duplicado cubierto si está activado)
+            inicio = time.perf_counter()
+            if SOLICITUDES_CUBIERTAS:
+                respuesta = enviar_transaccion_cubierta(transaccion)
+            else:
+                respuesta = enviar_transaccion(transaccion)
+            telemetria.registrar(respuesta is not None, time.perf_counter() - inicio)
+            
+            if not silencioso:
+                if respuesta:
+                    print(f"Transacción {i+1} insertada: {respuesta['idTransaccion']}")
+                else:
+                    print(f"Error en transacción {i+1}: No se pudo insertar. Ver errores.log.")
+            
+            # Pausa para evitar límites de tasa
+            time.sleep(0.5)
             
     print("Inserción de datos completada.")
 
+def prueba_carga(perfil, n, tasa=None, semilla=None, silencioso=True, archivo_metricas=None):
+    """
+    Prueba de carga en lazo abierto con un perfil de carga.py (universo de cuentas con sesgo,
+    montos y llegadas Poisson o constantes). A diferencia de insertar_datos, no espera la
+    respuesta anterior para enviar la siguiente y mide la latencia desde el instante programado.
+    Args:
+        perfil (str): Nombre del perfil en carga.PERFILES ('demo', 'zipf', 'caliente', 'diario').
+        n (int): Número de transacciones a enviar.
+        tasa (float): Transacciones por segundo; por defecto la del perfil.
+        semilla (int): Semilla para repetir la misma carga.
+    Returns:
+        dict: Resumen de ejecutar_abierto (latencias desde el instante programado y de servicio).
+    """
+    parametros = dict(PERFILES[perfil], tipos=TIPOS_TRANSACCION, descripciones=DESCRIPCIONES, semilla=semilla)
+    if tasa:
+        parametros['tasa'] = tasa
+    modelo = ModeloCarga(**parametros)
+
+    def enviar(transaccion):
+        if not validar_transaccion(transaccion, modelo.cuentas):
+            return None
+        if SOLICITUDES_CUBIERTAS:
+            return enviar_transaccion_cubierta(transaccion)
+        return enviar_transaccion(transaccion)
+
+    print(f"Prueba '{perfil}': {n} transacciones a {modelo.tasa} tx/s ({modelo.proceso}) "
+          f"sobre {len(modelo.cuentas)} cuentas ({modelo.cuentas.sesgo})...")
+    with Telemetria(total=n, nombre=f'carga_{perfil}', mostrar=silencioso,
+                    archivo_metricas=archivo_metricas or ARCHIVO_METRICAS) as telemetria:
+        resultado = ejecutar_abierto(modelo, enviar, n, telemetria)
+
+    print(f"Enviadas: {resultado['enviadas']} - Exitosas: {resultado['exitos']} en {resultado['duracion']:.1f} s")
+    if resultado['errores']:
+        print(f"Advertencia: {resultado['errores']} envíos terminaron con una excepción (respuesta no válida)")
+    print(f"Latencia desde el instante programado: p50 {resultado['p50'] * 1000:.0f} ms - "
+          f"p99 {resultado['p99'] * 1000:.0f} ms")
+    print(f"Latencia de servicio: p50 {resultado['p50_servicio'] * 1000:.0f} ms - "
+          f"p99 {resultado['p99_servicio'] * 1000:.0f} ms")
+    if resultado['atraso_maximo'] > 0.1:
+        print(f"Aviso: el generador se atrasó hasta {resultado['atraso_maximo']:.2f} s; "
+              "la máquina cliente no alcanza la tasa pedida.")
+    return resultado
+
+def consultar_historial(id_cuenta, desde=None, hasta=None, tipo=None, limite=100, orden='asc'):
+    """
+    Recorre el historial de una cuenta con GET /transacciones/cuenta/{idCuenta}, página por página.
+    Args:
+        id_cuenta (str): Cuenta a consultar.
+        desde (str): Fecha ISO 8601 inicial (incluida), opcional.
+        hasta (str): Fecha ISO 8601 final (incluida), opcional.
+        tipo (str): DEPOSITO o RETIRO, opcional.
+        limite (int): Movimientos por página.
+        orden (str): 'asc' (más antiguos primero) o 'desc' (más recientes primero).
+    Returns:
+        generator: Una tupla (lista de movimientos, segundos de la solicitud) por página.
+    """
+    params = {'limite': limite}
+    for clave, valor in (('desde', desde), ('hasta', hasta), ('tipo', tipo), ('orden', orden)):
+        if valor:
+            params[clave] = valor
+    while True:
+        inicio = time.perf_counter()
+        response = requests.get(
+            f"{API_BASE_URL}/cuenta/{id_cuenta}",
+            params=params,
+            timeout=10,
+            hooks=HOOKS_CAPTURA
+        )
+        response.raise_for_status()
+        pagina = response.json()
+        yield pagina.get('items', []), time.perf_counter() - inicio
+        if not pagina.get('siguiente'):
+            break
+        params['siguiente'] = pagina['siguiente']
+
+def verificar_historial(id_cuenta, desde=None, hasta=None, tipo=None, limite=100, orden='asc'):
+    """
+    Consulta el historial completo de una cuenta y verifica que cada movimiento
+    pertenezca a la cuenta, esté en el rango y venga ordenado por fecha (ascendente,
+    o descendente si orden='desc'). Muestra el total, las páginas y la latencia por página.
+    """
+    descendente = orden == 'desc'
+    total, errores, latencias, anterior = 0, 0, [], None
+    inicio = time.perf_counter()
+    try:
+        for movimientos, segundos in consultar_historial(id_cuenta, desde, hasta, tipo, limite, orden):
+            latencias.append(segundos)
+            for movimiento in movimientos:
+                total += 1
+                fecha = movimiento.get('fechaHora', '')
+                desordenado = anterior is not None and (fecha > anterior if descendente else fecha < anterior)
+                if (movimiento.get('idCuenta') != id_cuenta
+                        or (desde and fecha < desde) or (hasta and fecha > hasta)
+                        or (tipo and movimiento.get('tipo') != tipo) or desordenado):
+                    errores += 1
+                    logging.error("Movimiento fuera del historial pedido: %s", movimiento,
+                                  extra={'clave': 'historial'})
+                anterior = fecha
+    except requests.exceptions.RequestException as e:
+        logging.error("Error al consultar historial: %s", e, extra={'clave': type(e).__name__})
+        print(f"Error al consultar el historial de {id_cuenta}. Ver errores.log.")
+        return
+
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    print(f"Historial de {id_cuenta}: {total} movimientos en {len(latencias)} páginas ({duracion:.2f} s)")
+    if latencias:
+        p50 = latencias[len(latencias) // 2]
+        p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+        print(f"Latencia por página: p50 {p50 * 1000:.0f} ms - p99 {p99 * 1000:.0f} ms")
+    if errores:
+        print(f"{errores} movimientos no cumplen el filtro. Ver errores.log.")
+    else:
+        print("Todos los movimientos cumplen el filtro y están ordenados por fecha.")
+
 def main():
     """
     Función principal para ejecutar el script.
-    Pregunta al usuario cuántas transacciones insertar y llama a insertar_datos.
+    Permite insertar transacciones de demostración, consultar el historial de una cuenta
+    o ejecutar una prueba de carga con un perfil de carga.py.
     """
+    print("1. Insertar transacciones de demostración")
+    print("2. Consultar historial de una cuenta")
+    print("3. Prueba de carga con perfil (lazo abierto)")
+    opcion = input("Seleccione una opción (1-3): ").strip()
+
+    if opcion == '3':
+        try:
+            perfil = input(f"Perfil ({', '.join(PERFILES)}): ").strip() or 'zipf'
+            if perfil not in PERFILES:
+                print(f"Perfil desconocido: {perfil}")
+                return
+            n = int(input("¿Cuántas transacciones desea enviar? "))
+            tasa = input("Transacciones por segundo (vacío = la del perfil): ").strip()
+            prueba_carga(perfil, n, float(tasa) if tasa else None)
+        except ValueError:
+            print("Error: Por favor, ingrese un número válido.")
+        return
+
+    if opcion == '2':
+        id_cuenta = input(f"Cuenta ({', '.join(CUENTAS)}): ").strip()
+        desde = input("Desde (ISO 8601, vacío = sin límite): ").strip() or None
+        hasta = input("Hasta (ISO 8601, vacío = sin límite): ").strip() or None
+        tipo = input("Tipo (DEPOSITO/RETIRO, vacío = todos): ").strip().upper() or None
+        orden = input("Orden (asc/desc, vacío = asc): ").strip().lower() or 'asc'
+        if orden not in ('asc', 'desc'):
+            print(f"Orden desconocido: {orden}")
+            return
+        verificar_historial(id_cuenta, desde, hasta, tipo, orden=orden)
+        return
+
     try:
         # Solicitamos el número de transacciones
         n = int(input("¿Cuántas transacciones de demostración desea insertar? "))
@@ -169,8 +418,12 @@ def main():
             print("Por favor, ingrese un número positivo.")
             return
         
+        # Opciones para cargas largas: línea de estado y exportación de métricas
+        silencioso = input("¿Modo silencioso con línea de estado? (s/n): ").strip().lower() == 's'
+        archivo_metricas = input("Archivo de métricas .prom o .json (vacío = ninguno): ").strip() or None
+
         # Ejecutamos la inserción
-        insertar_datos(n)
+        insertar_datos(n, silencioso, archivo_metricas)
         
     except ValueError:
         print("Error: Por favor, ingrese un número válido.")
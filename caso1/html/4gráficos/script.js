@@ -1,7 +1,18 @@
 document.addEventListener('DOMContentLoaded', function() {
+    // Datos de ejemplo; se reemplazan por datos.json si existe (generado con caso1/analitica.py)
+    fetch('datos.json')
+        .then(respuesta => respuesta.ok ? respuesta.json() : null)
+        .catch(() => null)
+        .then(dibujarGraficos);
+});
+
+function dibujarGraficos(resumen) {
     // Datos comunes para los gráficos
-    const labels = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo'];
-    const datos = [12, 19, 3, 5, 2];
+    const labels = resumen ? resumen.labels : ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo'];
+    const datos = resumen ? resumen.datos : [12, 19, 3, 5, 2];
+    const titulo = resumen ? resumen.titulo : 'Ventas Mensuales';
+    // Serie mensual de depósitos para el gráfico de líneas (si los datos traen fechas)
+    const mensual = resumen && resumen.mensual && resumen.mensual.meses ? resumen.mensual : null;
     const coloresFondo = [
         'rgba(255, 99, 132, 0.2)',
         'rgba(54, 162, 235, 0.2)',
@@ -24,7 +35,7 @@ document.addEventListener('DOMContentLoaded', function() {
         data: {
             labels: labels,
             datasets: [{
-                label: 'Ventas Mensuales',
+                label: titulo,
                 data: datos,
                 backgroundColor: coloresFondo,
                 borderColor: coloresBorde,
@@ -46,10 +57,10 @@ document.addEventListener('DOMContentLoaded', function() {
     new Chart(ctxLineas, {
         type: 'line',
         data: {
-            labels: labels,
+            labels: mensual ? mensual.meses : labels,
             datasets: [{
-                label: 'Ventas Mensuales',
-                data: datos,
+                label: mensual ? 'Depósitos por mes' : titulo,
+                data: mensual ? mensual.depositos : datos,
                 backgroundColor: coloresFondo[1],
                 borderColor: coloresBorde[1],
                 borderWidth: 2,
@@ -73,7 +84,7 @@ document.addEventListener('DOMContentLoaded', function() {
         data: {
             labels: labels,
             datasets: [{
-                label: 'Ventas Mensuales',
+                label: titulo,
                 data: datos,
                 backgroundColor: coloresFondo,
                 borderColor: coloresBorde,
@@ -94,7 +105,7 @@ document.addEventListener('DOMContentLoaded', function() {
         data: {
             labels: labels,
             datasets: [{
-                label: 'Ventas Mensuales',
+                label: titulo,
                 data: datos,
                 backgroundColor: coloresFondo,
                 borderColor: coloresBorde,
@@ -107,4 +118,4 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         }
     });
-});
\ No newline at end of file
+}
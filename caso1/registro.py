@@ -0,0 +1,188 @@
+# Importamos las bibliotecas necesarias
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class FormatoJSON(logging.Formatter):
+    """Convierte cada registro en una línea JSON (formato JSON Lines)."""
+
+    def format(self, record):
+        datos = {
+            'fecha': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'nivel': record.levelname,
+            'mensaje': record.getMessage()
+        }
+        # Campos opcionales que agregan los llamadores o el limitador
+        for campo in ('clave', 'repeticiones', 'ventana', 'descartados'):
+            if hasattr(record, campo):
+                datos[campo] = getattr(record, campo)
+        if record.exc_text:
+            datos['excepcion'] = record.exc_text  # Ya formateada por ManejadorAsincrono.prepare
+        elif record.exc_info:
+            datos['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+# Solo se usa para convertir las excepciones en texto (ver ManejadorAsincrono.prepare)
+_FORMATO_EXCEPCION = logging.Formatter()
+
+
+class ManejadorAsincrono(logging.handlers.QueueHandler):
+    """
+    Manejador que solo encola los registros; la escritura al archivo la hace
+    un hilo en segundo plano (QueueListener).
+
+    Además agrupa los errores repetidos: la primera ocurrencia de cada clave en
+    una ventana de tiempo se escribe completa y el resto solo se cuenta
+    (o se escribe con probabilidad `muestreo`). Al cerrar la ventana se emite
+    un resumen del tipo "503 x 4812 en los últimos 10 s".
+    """
+
+    def __init__(self, cola, ventana=10.0, muestreo=0.0):
+        super().__init__(cola)
+        self.ventana = ventana
+        self.muestreo = muestreo
+        self.descartados = 0  # Registros perdidos porque la cola estaba llena
+        self._ventanas = {}  # clave -> [inicio, ocurrencias, escritos, registro_base]
+        self._candado = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._vaciar_periodicamente, daemon=True)
+        self._hilo.start()
+
+    def prepare(self, record):
+        # El mensaje se arma aquí, en el hilo que registra: si se dejara para el hilo de
+        # escritura, un argumento que cambie después (p. ej. un diccionario) se escribiría
+        # con su valor nuevo. El JSON se sigue armando en segundo plano.
+        registro = copy.copy(record)  # Otros manejadores reciben el registro original
+        registro.msg = record.getMessage()
+        registro.args = None
+        if record.exc_info:
+            # La traza se convierte en texto antes de cruzar al otro hilo
+            registro.exc_text = record.exc_text or _FORMATO_EXCEPCION.formatException(record.exc_info)
+            registro.exc_info = None
+        return registro
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._candado:
+                self.descartados += 1
+
+    def emit(self, record):
+        clave = getattr(record, 'clave', None)
+        if clave is None:
+            clave = record.msg  # Por defecto se agrupa por la plantilla del mensaje
+        record = self.prepare(record)
+        ahora = time.monotonic()
+        resumen = None
+        with self._candado:
+            estado = self._ventanas.get(clave)
+            if estado is not None and ahora - estado[0] >= self.ventana:
+                resumen = self._resumen(clave, estado)
+                estado = None
+            if estado is None:
+                self._ventanas[clave] = [ahora, 1, 1, record]
+                escribir = True
+            else:
+                estado[1] += 1
+                escribir = self.muestreo > 0 and random.random() < self.muestreo
+                if escribir:
+                    estado[2] += 1
+        if resumen is not None:
+            self.enqueue(resumen)
+        if escribir:
+            self.enqueue(record)
+
+    def _resumen(self, clave, estado):
+        """Crea el registro de resumen de una ventana, o None si no hubo repeticiones."""
+        ocurrencias, escritos, base = estado[1:]
+        if ocurrencias <= escritos:
+            return None
+        return logging.makeLogRecord({
+            'name': base.name,
+            'levelno': base.levelno,
+            'levelname': base.levelname,
+            'msg': '%s x %d en los últimos %g s',
+            'args': (clave, ocurrencias, self.ventana),
+            'clave': clave,
+            'repeticiones': ocurrencias,
+            'ventana': self.ventana
+        })
+
+    def vaciar(self, forzar=False):
+        """Emite los resúmenes de las ventanas vencidas (o de todas si forzar=True)."""
+        ahora = time.monotonic()
+        resumenes = []
+        with self._candado:
+            for clave, estado in list(self._ventanas.items()):
+                if forzar or ahora - estado[0] >= self.ventana:
+                    resumen = self._resumen(clave, estado)
+                    if resumen is not None:
+                        resumenes.append(resumen)
+                    del self._ventanas[clave]
+            descartados = self.descartados if forzar else 0
+            if descartados:
+                self.descartados = 0
+        for resumen in resumenes:
+            self.enqueue(resumen)
+        if descartados:
+            self.enqueue(logging.makeLogRecord({
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': 'Registros descartados por cola llena: %d',
+                'args': (descartados,),
+                'descartados': descartados
+            }))
+
+    def _vaciar_periodicamente(self):
+        while not self._detener.wait(self.ventana):
+            self.vaciar()
+
+    def close(self):
+        self._detener.set()
+        self.vaciar(forzar=True)
+        super().close()
+
+
+def configurar_registro(archivo='errores.log', nivel=logging.ERROR, ventana=10.0,
+                        muestreo=0.0, capacidad=10000):
+    """
+    Configura el registro de errores en segundo plano con salida JSON Lines.
+    Args:
+        archivo (str): Archivo de salida.
+        nivel (int): Nivel mínimo a registrar.
+        ventana (float): Segundos de agrupación de errores repetidos.
+        muestreo (float): Fracción (0 a 1) de repeticiones que se escriben completas.
+        capacidad (int): Tamaño máximo de la cola; si se llena se descartan registros.
+    Returns:
+        QueueListener: El hilo de escritura (se detiene solo al terminar el programa).
+    """
+    cola = queue.Queue(maxsize=capacidad)
+    manejador_archivo = logging.FileHandler(archivo, encoding='utf-8')
+    manejador_archivo.setFormatter(FormatoJSON())
+    escritor = logging.handlers.QueueListener(cola, manejador_archivo)
+
+    manejador = ManejadorAsincrono(cola, ventana=ventana, muestreo=muestreo)
+    raiz = logging.getLogger()
+    raiz.setLevel(nivel)
+    raiz.addHandler(manejador)
+    escritor.start()
+
+    def cerrar():
+        # Primero se vacían los resúmenes pendientes y luego se detiene el hilo
+        raiz.removeHandler(manejador)
+        manejador.close()
+        escritor.stop()
+        manejador_archivo.close()
+
+    atexit.register(cerrar)
+    return escritor
@@ -1,13 +1,36 @@
 import json
+import re
 import boto3
 
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table('ItemsTable')
 
+# Nombres de atributo aceptados en ?fields= (los items de ItemsTable no tienen esquema fijo)
+NOMBRE_CAMPO = re.compile(r'^[A-Za-z_][A-Za-z0-9_]{0,63}$')
+MAX_CAMPOS = 20
+
+def proyeccion(fields):
+    # ?fields=id,nombre -> solo se leen esos atributos (ProjectionExpression)
+    if not fields:
+        return {}
+    campos = list(dict.fromkeys(c.strip() for c in fields.split(',') if c.strip()))
+    if not campos or len(campos) > MAX_CAMPOS or not all(NOMBRE_CAMPO.match(c) for c in campos):
+        raise ValueError(f'fields debe tener entre 1 y {MAX_CAMPOS} nombres de atributo separados por comas')
+    nombres = {f'#c{i}': campo for i, campo in enumerate(campos)}  # Evita choques con palabras reservadas
+    return {'ProjectionExpression': ', '.join(nombres), 'ExpressionAttributeNames': nombres}
+
 def lambda_handler(event, context):
     try:
-        response = table.scan()
-        items = reponse.get('Items', [])
+        parametros = event.get('queryStringParameters') or {}
+        try:
+            argumentos = proyeccion(parametros.get('fields'))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': str(e)})
+            }
+        response = table.scan(**argumentos)
+        items = response.get('Items', [])
         return {
             'statusCode': 200,
             'body': json.dumps({'Items':items})
@@ -18,4 +41,3 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
-